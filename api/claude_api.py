@@ -66,6 +66,35 @@ class ClaudeAPI:
             logging.error(f"Error generating response from Claude: {str(e)}")
             raise Exception(f"Failed to generate response: {str(e)}")
     
+    def complete(self, system_prompt, user_content, max_tokens=2000):
+        """
+        Generate a single-turn response, with the system prompt marked for
+        prompt caching. The cache only applies once the prompt reaches the
+        model's minimum cacheable length (1024 tokens, 2048 for Haiku models);
+        shorter prompts are billed in full on every call.
+        
+        Args:
+            system_prompt (str): Fixed instructions, identical across calls
+            user_content (str): The per-call message
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 2000.
+            
+        Returns:
+            str: The generated response
+        """
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+                messages=[{"role": "user", "content": user_content}],
+                max_tokens=max_tokens
+            )
+            
+            return response.content[0].text
+        
+        except Exception as e:
+            logging.error(f"Error generating completion with Claude: {str(e)}")
+            raise Exception(f"Failed to generate completion: {str(e)}")
+    
     def analyze_data(self, data, query, max_tokens=2000):
         """
         Analyze data using Claude.
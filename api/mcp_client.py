@@ -2,12 +2,34 @@ import os
 import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import subprocess
 import threading
 import queue
 import time
 from typing import Dict, Any, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj)
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Keep-alive connections the client holds open to the MCP server; size it to
+# the number of threads that call tools concurrently
+MCP_HTTP_POOL_SIZE = int(os.getenv("MCP_HTTP_POOL_SIZE", 20))
+
 # LLM provider imports
 try:
     import openai
@@ -210,6 +232,12 @@ class SimpleMCPClient:
         # Flag to indicate if the client is connected
         self.is_connected = False
         
+        # Pooled keep-alive connections to the MCP server, reused across tool calls
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MCP_HTTP_POOL_SIZE, pool_block=False)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        
         # Fetch available tools from server
         self.available_tools = []
     
@@ -242,7 +270,7 @@ class SimpleMCPClient:
         """
         try:
             # Check if server is running by making a health check request
-            response = requests.get(f"{self.server_url}/health", timeout=5)
+            response = self.http.get(f"{self.server_url}/health", timeout=5)
             
             if response.status_code == 200:
                 self.is_connected = True
@@ -250,7 +278,7 @@ class SimpleMCPClient:
                 
                 # Fetch available tools
                 try:
-                    tools_response = requests.get(f"{self.server_url}/tools", timeout=5)
+                    tools_response = self.http.get(f"{self.server_url}/tools", timeout=5)
                     if tools_response.status_code == 200:
                         tools_data = tools_response.json()
                         self.available_tools = tools_data.get("tools", [])
@@ -288,14 +316,14 @@ class SimpleMCPClient:
                     
                     # Try connecting again
                     try:
-                        response = requests.get(f"{self.server_url}/health", timeout=5)
+                        response = self.http.get(f"{self.server_url}/health", timeout=5)
                         if response.status_code == 200:
                             self.is_connected = True
                             logging.info(f"Successfully started and connected to MCP server at {self.server_url}")
                             
                             # Fetch available tools
                             try:
-                                tools_response = requests.get(f"{self.server_url}/tools", timeout=5)
+                                tools_response = self.http.get(f"{self.server_url}/tools", timeout=5)
                                 if tools_response.status_code == 200:
                                     tools_data = tools_response.json()
                                     self.available_tools = tools_data.get("tools", [])
@@ -478,7 +506,10 @@ class SimpleMCPClient:
                     
                     # Execute tool call by sending request to MCP server
                     result = self._execute_tool_call(tool_name, tool_args)
-                    tool_result = f"Tool: {tool_name}\nInput: {json.dumps(tool_args)}\nOutput: {json.dumps(result)}"
+                    # Tool results (e.g. hourly series) can be large; serialize each once
+                    args_json = _json_dumps(tool_args)
+                    result_json = _json_dumps(result)
+                    tool_result = f"Tool: {tool_name}\nInput: {args_json}\nOutput: {result_json}"
                     tool_results.append(tool_result)
                     
                     # Continue conversation with tool results
@@ -490,7 +521,7 @@ class SimpleMCPClient:
                             "type": "function",
                             "function": {
                                 "name": tool_name,
-                                "arguments": json.dumps(tool_args)
+                                "arguments": args_json
                             }
                         }]
                     })
@@ -498,7 +529,7 @@ class SimpleMCPClient:
                     messages.append({
                         "role": "tool", 
                         "tool_call_id": tool_call.get('id', f"call_{len(messages)-1}"),
-                        "content": json.dumps(result)
+                        "content": result_json
                     })
                 
                 # If tool calls were made, get a final response from LLM
@@ -537,7 +568,7 @@ class SimpleMCPClient:
         """
         try:
             # Send request to MCP server
-            response = requests.post(
+            response = self.http.post(
                 f"{self.server_url}/api/tool",
                 json={
                     "tool": tool_name,
@@ -547,7 +578,7 @@ class SimpleMCPClient:
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _json_loads(response.content)
             else:
                 logging.error(f"Error executing tool call: {response.status_code} - {response.text}")
                 return {
@@ -658,7 +689,7 @@ class SimpleMCPClient:
                     "location": location,
                     "time_period": time_period,
                     "data": data,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": end_date.isoformat()
                 }
                 
             elif tool_name == "create_dashboard":
@@ -667,7 +698,8 @@ class SimpleMCPClient:
                 description = tool_args.get("description", f"Dashboard for {dashboard_type} data visualization")
                 
                 # Generate a unique dashboard ID
-                dashboard_id = f"{dashboard_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                now = datetime.now()
+                dashboard_id = f"{dashboard_type}_{now.strftime('%Y%m%d%H%M%S')}"
                 
                 return {
                     "status": "success",
@@ -676,7 +708,7 @@ class SimpleMCPClient:
                     "title": title,
                     "description": description,
                     "url": f"/dashboards/{dashboard_id}",
-                    "created_at": datetime.now().isoformat(),
+                    "created_at": now.isoformat(),
                     "message": f"Dashboard '{title}' created successfully"
                 }
                 
@@ -731,6 +763,7 @@ class SimpleMCPClient:
                 self.server_process.terminate()
                 self.server_process = None
             
+            self.http.close()
             self.is_connected = False
             logging.info("MCP client resources cleaned up")
         except Exception as e:
@@ -1,10 +1,45 @@
 import requests
+import hashlib
 import json
 import os
 import logging
 from urllib.parse import urljoin
+import re
 import time
 import uuid
+from collections import OrderedDict
+
+# Query keywords per dashboard type, in match priority order. Each type's
+# keywords are compiled into one case-insensitive alternation at import.
+DASHBOARD_TYPE_PATTERNS = [
+    (dashboard_type, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+    for dashboard_type, keywords in [
+        ('solar_farm', ['solar', 'sun', 'photovoltaic', 'pv']),
+        ('wind_farm', ['wind', 'turbine', 'windmill']),
+        ('cbg', ['bio', 'gas', 'methane', 'organic', 'waste', 'community', 'compressed']),
+        ('hybrid_plant', ['multiple', 'combined', 'hybrid', 'mix', 'integrated'])
+    ]
+]
+
+# Data keys that mark a dataset as time-based
+TIME_KEYS = frozenset(["date", "time", "timestamp"])
+
+# Sources requested from the MCP server for every data fetch
+FETCH_DATA_SOURCES = ("renewable_energy_db", "web_scraping", "external_apis")
+
+# Data the MCP server should include for each dashboard type
+DASHBOARD_DATA_REQUIREMENTS = {
+    "cbg": ("generation", "community", "forecast", "environmental_impact"),
+    "solar_farm": ("solar_generation", "irradiance", "efficiency", "forecast"),
+    "wind_farm": ("wind_generation", "wind_speed", "turbine_efficiency", "forecast"),
+    "hybrid_plant": ("generation_mix", "efficiency_comparison", "forecast", "optimization")
+}
+
+# Embed snippet returned for static dashboards
+EMBED_CODE_TEMPLATE = '<iframe src="{src}" width="100%" height="600px" frameborder="0"></iframe>'
+
+# Number of serialized dashboard figures kept per client
+FIGURE_CACHE_MAXSIZE = 64
 
 class MCPServer:
     def __init__(self, server_url=None, api_key=None, auto_generate_key=False):
@@ -41,6 +76,9 @@ class MCPServer:
         # Flag to indicate if we should use mock data instead of real API calls
         self.use_mock_mode = False
         
+        # LRU of serialized dashboard figures, keyed by a digest of their inputs
+        self._figure_cache = OrderedDict()
+        
         logging.info("MCP server client initialized")
     
     def _get_api_key(self):
@@ -128,7 +166,7 @@ class MCPServer:
             # Prepare the request payload
             payload = {
                 "query": query,
-                "data_sources": ["renewable_energy_db", "web_scraping", "external_apis"],
+                "data_sources": FETCH_DATA_SOURCES,
                 "format": "json"
             }
             
@@ -138,14 +176,9 @@ class MCPServer:
                 payload["include_visualization_data"] = True
                 
                 # Add specific data requirements based on dashboard type
-                if dashboard_type == "cbg":
-                    payload["data_requirements"] = ["generation", "community", "forecast", "environmental_impact"]
-                elif dashboard_type == "solar_farm":
-                    payload["data_requirements"] = ["solar_generation", "irradiance", "efficiency", "forecast"]
-                elif dashboard_type == "wind_farm":
-                    payload["data_requirements"] = ["wind_generation", "wind_speed", "turbine_efficiency", "forecast"]
-                elif dashboard_type == "hybrid_plant":
-                    payload["data_requirements"] = ["generation_mix", "efficiency_comparison", "forecast", "optimization"]
+                data_requirements = DASHBOARD_DATA_REQUIREMENTS.get(dashboard_type)
+                if data_requirements:
+                    payload["data_requirements"] = data_requirements
             
             # Send the request to the MCP server
             response = requests.post(
@@ -190,17 +223,10 @@ class MCPServer:
         Returns:
             str: The inferred dashboard type
         """
-        query_lower = query.lower()
-        
         # Check for specific energy types
-        if any(term in query_lower for term in ['solar', 'sun', 'photovoltaic', 'pv']):
-            return 'solar_farm'
-        elif any(term in query_lower for term in ['wind', 'turbine', 'windmill']):
-            return 'wind_farm'
-        elif any(term in query_lower for term in ['bio', 'gas', 'methane', 'organic', 'waste', 'community', 'compressed']):
-            return 'cbg'
-        elif any(term in query_lower for term in ['multiple', 'combined', 'hybrid', 'mix', 'integrated']):
-            return 'hybrid_plant'
+        for dashboard_type, pattern in DASHBOARD_TYPE_PATTERNS:
+            if pattern.search(query):
+                return dashboard_type
         
         # Default to CBG if no specific type is mentioned
         return 'cbg'
@@ -535,10 +561,11 @@ class MCPServer:
             f.write(dashboard_html)
         
         # Return the dashboard information with a URL that points to the static file
+        dashboard_url = f"/static/dashboards/{dashboard_id}.html"
         return {
             "dashboard_id": dashboard_id,
-            "url": f"/static/dashboards/{dashboard_id}.html",
-            "embed_code": f'<iframe src="/static/dashboards/{dashboard_id}.html" width="100%" height="600px" frameborder="0"></iframe>',
+            "url": dashboard_url,
+            "embed_code": EMBED_CODE_TEMPLATE.format(src=dashboard_url),
             "note": "This is a static dashboard created in mock mode."
         }
     
@@ -556,16 +583,118 @@ class MCPServer:
         Returns:
             str: The HTML content for the dashboard
         """
-        import json
-        import plotly.graph_objects as go
-        import plotly.express as px
-        from plotly.subplots import make_subplots
-        import pandas as pd
         from datetime import datetime
         
         # Extract dashboard type from layout
         dashboard_type = layout.get('type') if layout and isinstance(layout, dict) else 'cbg'
         
+        figure_json = self._get_dashboard_figure_json(dashboard_type, title, description, data)
+        
+        # Generate HTML
+        dashboard_html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>{title}</title>
+            <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+            <style>
+                body {{
+                    font-family: Arial, sans-serif;
+                    margin: 0;
+                    padding: 20px;
+                    background-color: #f5f5f5;
+                }}
+                .dashboard-container {{
+                    max-width: 1200px;
+                    margin: 0 auto;
+                    background-color: white;
+                    padding: 20px;
+                    border-radius: 8px;
+                    box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
+                }}
+                h1 {{
+                    color: #333;
+                    border-bottom: 1px solid #eee;
+                    padding-bottom: 10px;
+                }}
+                .description {{
+                    color: #666;
+                    margin-bottom: 20px;
+                }}
+                .dashboard-id {{
+                    color: #999;
+                    font-size: 12px;
+                    margin-top: 20px;
+                }}
+                .data-timestamp {{
+                    color: #999;
+                    font-size: 12px;
+                    margin-top: 10px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="dashboard-container">
+                <h1>{title}</h1>
+                <div class="description">{description}</div>
+                <div id="dashboard"></div>
+                <div class="data-timestamp">Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
+                <div class="dashboard-id">Dashboard ID: {dashboard_id}</div>
+            </div>
+            <script>
+                var dashboardData = {figure_json};
+                Plotly.newPlot('dashboard', dashboardData.data, dashboardData.layout);
+            </script>
+        </body>
+        </html>
+        """
+        
+        return dashboard_html
+    
+    def _get_dashboard_figure_json(self, dashboard_type, title, description, data):
+        """
+        Get the serialized Plotly figure for a dashboard, building it only when
+        the same type, title, description and data haven't been rendered recently.
+        
+        Returns:
+            str: The figure as Plotly JSON
+        """
+        try:
+            key = hashlib.blake2b(
+                json.dumps([dashboard_type, title, description, data], sort_keys=True, default=str).encode(),
+                digest_size=16
+            ).digest()
+        except (TypeError, ValueError):
+            key = None
+        
+        if key is not None and key in self._figure_cache:
+            self._figure_cache.move_to_end(key)
+            return self._figure_cache[key]
+        
+        import plotly.io as pio
+        
+        # The figure was validated as it was built; skip the second validation
+        # pass. The "auto" engine serializes with orjson when it is installed.
+        figure = self._build_dashboard_figure(dashboard_type, title, description, data)
+        figure_json = pio.to_json(figure, validate=False)
+        
+        if key is not None:
+            self._figure_cache[key] = figure_json
+            while len(self._figure_cache) > FIGURE_CACHE_MAXSIZE:
+                self._figure_cache.popitem(last=False)
+        return figure_json
+    
+    def _build_dashboard_figure(self, dashboard_type, title, description, data):
+        """
+        Build the Plotly figure for a static dashboard.
+        
+        Returns:
+            plotly.graph_objects.Figure: The dashboard figure
+        """
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        import pandas as pd
+        
         # Create a subplot figure
         fig = make_subplots(
             rows=2, cols=2,
@@ -815,66 +944,7 @@ class MCPServer:
             font=dict(size=12)
         )
         
-        # Generate HTML
-        dashboard_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{title}</title>
-            <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    margin: 0;
-                    padding: 20px;
-                    background-color: #f5f5f5;
-                }}
-                .dashboard-container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-                }}
-                h1 {{
-                    color: #333;
-                    border-bottom: 1px solid #eee;
-                    padding-bottom: 10px;
-                }}
-                .description {{
-                    color: #666;
-                    margin-bottom: 20px;
-                }}
-                .dashboard-id {{
-                    color: #999;
-                    font-size: 12px;
-                    margin-top: 20px;
-                }}
-                .data-timestamp {{
-                    color: #999;
-                    font-size: 12px;
-                    margin-top: 10px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="dashboard-container">
-                <h1>{title}</h1>
-                <div class="description">{description}</div>
-                <div id="dashboard"></div>
-                <div class="data-timestamp">Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-                <div class="dashboard-id">Dashboard ID: {dashboard_id}</div>
-            </div>
-            <script>
-                var dashboardData = {json.dumps(fig.to_dict())};
-                Plotly.newPlot('dashboard', dashboardData.data, dashboardData.layout);
-            </script>
-        </body>
-        </html>
-        """
-        
-        return dashboard_html
+        return fig
     
     def update_dashboard(self, dashboard_id, data=None, layout=None, settings=None):
         """
@@ -954,7 +1024,7 @@ class MCPServer:
                 })
                 
                 # Add time series chart if time-based data is present
-                if any(key.lower() in ["date", "time", "timestamp"] for key in data.keys()):
+                if any(key.lower() in TIME_KEYS for key in data.keys()):
                     layout["widgets"].append({
                         "type": "line_chart",
                         "position": {"row": 0, "col": 1},
@@ -89,6 +89,36 @@ class OpenAIAPI:
             logging.error(f"Error generating response: {str(e)}")
             raise Exception(f"Failed to generate response: {str(e)}")
     
+    def complete(self, system_prompt, user_content, max_tokens=2000):
+        """
+        Generate a single-turn response. The system prompt goes first and
+        unchanged, so automatic prefix caching can reuse it once the prompt
+        is at least 1024 tokens long.
+        
+        Args:
+            system_prompt (str): Fixed instructions, identical across calls
+            user_content (str): The per-call message
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 2000.
+            
+        Returns:
+            str: The generated response
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content}
+                ],
+                max_tokens=max_tokens
+            )
+            
+            return response.choices[0].message.content
+        
+        except Exception as e:
+            logging.error(f"Error generating completion: {str(e)}")
+            raise Exception(f"Failed to generate completion: {str(e)}")
+    
     def analyze_data(self, data, query, max_tokens=2000):
         """
         Analyze data using the API.
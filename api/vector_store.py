@@ -1,18 +1,69 @@
+import atexit
 import logging
 from datetime import datetime
-import json
 import os
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from sentence_transformers import SentenceTransformer
 import faiss
-from sqlalchemy import create_engine, Column, String, JSON, DateTime
+from sqlalchemy import create_engine, event, Column, String, JSON, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import pickle
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# all-MiniLM-L6-v2 embedding size
+EMBEDDING_DIM = 384
+# HNSW graph degree and build/search beam widths for new indices, whose
+# vectors are stored as FP16 to halve the bytes read per distance
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+# Texts per sentence-transformer forward pass when ingesting in bulk
+EMBEDDING_BATCH_SIZE = 64
+# Index files are rewritten after this many inserts or this many seconds,
+# whichever comes first, rather than after every insert
+INDEX_FLUSH_INSERTS = 100
+INDEX_FLUSH_INTERVAL = 30
+# Recent query strings whose embeddings are kept, so repeats skip the model
+QUERY_EMBEDDING_CACHE_SIZE = 256
+# Keys left out of embedded text: they vary per record but carry no meaning
+NON_SEMANTIC_FIELDS = frozenset({"id", "timestamp", "created_at", "updated_at"})
+
 Base = declarative_base()
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so metadata reads don't block behind the writer"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+def _flatten_fields(data: Dict[str, Any], prefix: str = ""):
+    """Yield "key: value" lines for a dict, with nested keys dotted"""
+    for key in sorted(data, key=str):
+        if key in NON_SEMANTIC_FIELDS:
+            continue
+        value = data[key]
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten_fields(value, f"{name}.")
+        elif isinstance(value, (list, tuple)):
+            yield f"{name}: {', '.join(map(str, value))}"
+        else:
+            yield f"{name}: {value}"
+
+def _json_serializer(obj: Any) -> str:
+    """Serialize a JSON column value with orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
 class Document(Base):
     """SQLite model for storing document metadata"""
     __tablename__ = 'documents'
@@ -33,7 +84,9 @@ class VectorStore:
         # Initialize SQLite database
         db_path = os.path.join(os.getcwd(), "data", "vector_store", "metadata.db")
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        json_kwargs = {} if orjson is None else {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+        self.engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False}, **json_kwargs)
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
         
@@ -50,16 +103,16 @@ class VectorStore:
         for data_type, path in self.index_paths.items():
             if os.path.exists(path):
                 try:
-                    self.indices[data_type] = faiss.read_index(path)
+                    self.indices[data_type] = self._upgrade_index(data_type, faiss.read_index(path))
                     self.logger.info(f"Loaded existing FAISS index for {data_type}")
                 except Exception as e:
                     self.logger.error(f"Error loading index for {data_type}: {e}")
-                    # Create a new L2 index
-                    self.indices[data_type] = faiss.IndexFlatL2(384)  # 384 is the dimension of all-MiniLM-L6-v2 embeddings
+                    # Create a new HNSW index
+                    self.indices[data_type] = self._new_index()
                     self.logger.info(f"Created new FAISS index for {data_type} after load failure")
             else:
-                # Create a new L2 index
-                self.indices[data_type] = faiss.IndexFlatL2(384)  # 384 is the dimension of all-MiniLM-L6-v2 embeddings
+                # Create a new HNSW index
+                self.indices[data_type] = self._new_index()
                 self.logger.info(f"Created new FAISS index for {data_type}")
         
         # Initialize sentence transformer model
@@ -68,20 +121,126 @@ class VectorStore:
         except Exception as e:
             self.logger.error(f"Error loading sentence transformer model: {e}")
             raise
+        
+        # Indices with inserts not yet written to disk; flushed in batches and at exit
+        self._dirty = set()
+        self._inserts_since_flush = 0
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+        atexit.register(self.flush)
+        
+        # LRU of query text -> read-only embedding
+        self._query_embeddings = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+        
+        # A crash can leave an index file behind its SQLite rows; catch it up
+        self._reconcile_indices()
+
+    def _new_index(self):
+        """Empty HNSW index over FP16-stored vectors: approximate, sub-linear L2 search"""
+        index = faiss.IndexHNSWSQ(EMBEDDING_DIM, faiss.ScalarQuantizer.QT_fp16, HNSW_M, faiss.METRIC_L2)
+        # FP16 encoding needs no statistics; training only marks the index ready
+        index.train(np.zeros((1, EMBEDDING_DIM), dtype=np.float32))
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+
+    def _upgrade_index(self, data_type: str, index):
+        """Rebuild a FP32 index written by older versions as HNSW + FP16, keeping vector order"""
+        if isinstance(index, faiss.IndexHNSWSQ):
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+            return index
+        if not isinstance(index, (faiss.IndexFlat, faiss.IndexHNSWFlat)):
+            return index
+        
+        upgraded = self._new_index()
+        if index.ntotal:
+            vectors = index.reconstruct_n(0, index.ntotal)
+            faiss.normalize_L2(vectors)
+            upgraded.add(vectors)
+        self.indices[data_type] = upgraded
+        self._write_index(data_type)
+        self.logger.info(f"Rebuilt FAISS index for {data_type} as HNSW + FP16 ({index.ntotal} vectors)")
+        return upgraded
+
+    def _reconcile_indices(self) -> None:
+        """Re-embed documents whose vectors never reached the index file on disk"""
+        with self.Session() as session:
+            for data_type, index in self.indices.items():
+                docs = session.query(Document).filter_by(data_type=data_type).offset(index.ntotal).all()
+                if not docs:
+                    continue
+                embeddings = self._generate_embedding([self._prepare_document(doc.doc_metadata) for doc in docs])
+                index.add(embeddings)
+                self._write_index(data_type)
+                self.logger.warning(f"Re-embedded {len(docs)} {data_type} documents missing from the index")
+
+    def _write_index(self, data_type: str) -> None:
+        """Write an index to disk atomically, via a temporary file"""
+        path = self.index_paths[data_type]
+        faiss.write_index(self.indices[data_type], f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    def _mark_dirty(self, data_type: str, count: int) -> None:
+        """Record unsaved inserts, flushing once enough have built up or enough time has passed"""
+        with self._flush_lock:
+            self._dirty.add(data_type)
+            self._inserts_since_flush += count
+            due = (
+                self._inserts_since_flush >= INDEX_FLUSH_INSERTS
+                or time.monotonic() - self._last_flush >= INDEX_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every index with unsaved inserts to disk"""
+        with self._flush_lock:
+            for data_type in self._dirty:
+                self._write_index(data_type)
+            self._dirty.clear()
+            self._inserts_since_flush = 0
+            self._last_flush = time.monotonic()
 
-    def _generate_embedding(self, text: str) -> np.ndarray:
-        """Generate embeddings for input text."""
+    def _generate_embedding(self, text: Union[str, List[str]]) -> np.ndarray:
+        """Generate embeddings for input text: one vector for a string, one row per text for a list."""
         try:
-            embedding = self.model.encode(text)
-            return embedding.astype(np.float32)  # FAISS requires float32
+            texts = [text] if isinstance(text, str) else text
+            # Always encode as a batch, and unit-length vectors keep L2
+            # ranking equal to cosine similarity
+            embeddings = self.model.encode(
+                texts,
+                batch_size=max(1, min(EMBEDDING_BATCH_SIZE, len(texts))),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ).astype(np.float32)  # FAISS requires float32
+            return embeddings[0] if isinstance(text, str) else embeddings
         except Exception as e:
             self.logger.error(f"Error generating embedding: {e}")
             raise
 
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embedding for a query string, reusing it if the same query was seen recently."""
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(query)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(query)
+                return embedding
+        
+        embedding = self._generate_embedding(query)
+        embedding.setflags(write=False)
+        with self._query_embeddings_lock:
+            self._query_embeddings[query] = embedding
+            self._query_embeddings.move_to_end(query)
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding
+
     def _prepare_document(self, data: Dict[str, Any]) -> str:
-        """Convert data dictionary to a text document for embedding."""
+        """Convert data dictionary to plain "key: value" text for embedding."""
         try:
-            return json.dumps(data, sort_keys=True, default=str)
+            return " ".join(_flatten_fields(data))
         except Exception as e:
             self.logger.error(f"Error preparing document: {e}")
             raise
@@ -96,9 +255,6 @@ class VectorStore:
             # Add to FAISS index
             self.indices[data_type].add(embedding.reshape(1, -1))
             
-            # Save index to disk
-            faiss.write_index(self.indices[data_type], self.index_paths[data_type])
-            
             # Store metadata in SQLite
             doc_id = f"{data_type}_{datetime.now().isoformat()}"
             with self.Session() as session:
@@ -109,6 +265,7 @@ class VectorStore:
                 )
                 session.add(doc)
                 session.commit()
+            self._mark_dirty(data_type, 1)
             
             self.logger.info(f"Successfully stored {data_type} data with ID: {doc_id}")
             return True
@@ -116,6 +273,48 @@ class VectorStore:
             self.logger.error(f"Error storing data: {e}")
             return False
 
+    def store_data_batch(self, items: List[Tuple[Dict[str, Any], str]]) -> bool:
+        """Store many (data, data_type) pairs with one encode call and one index write per type."""
+        try:
+            if not items:
+                return True
+            
+            embeddings = self._generate_embedding([self._prepare_document(data) for data, _ in items])
+            
+            # Group rows by type, keeping item order: FAISS positions and
+            # SQLite insertion order must line up within each type
+            positions_by_type = {}
+            for position, (_, data_type) in enumerate(items):
+                positions_by_type.setdefault(data_type, []).append(position)
+            
+            # Reject the whole batch before writing anything, so no index
+            # gains vectors that have no rows
+            unknown_types = [data_type for data_type in positions_by_type if data_type not in self.indices]
+            if unknown_types:
+                raise KeyError(f"Unknown data types: {unknown_types}")
+            
+            # Store metadata in SQLite first; the suffix keeps ids unique within the batch
+            timestamp = datetime.now().isoformat()
+            docs = [
+                Document(id=f"{data_type}_{timestamp}_{position}", data_type=data_type, doc_metadata=items[position][0])
+                for data_type, positions in positions_by_type.items()
+                for position in positions
+            ]
+            with self.Session() as session:
+                session.bulk_save_objects(docs, return_defaults=False)
+                session.commit()
+            
+            # Only index vectors once their rows are committed
+            for data_type, positions in positions_by_type.items():
+                self.indices[data_type].add(embeddings[positions])
+                self._mark_dirty(data_type, len(positions))
+            
+            self.logger.info(f"Successfully stored {len(items)} documents in one batch")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error storing data batch: {e}")
+            return False
+
     def store_chat_data(self, question: str, answer: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Store chat Q&A pairs for future retrieval."""
         try:
@@ -134,7 +333,7 @@ class VectorStore:
         """Query the vector store for similar data."""
         try:
             # Generate query embedding
-            query_embedding = self._generate_embedding(query)
+            query_embedding = self._embed_query(query)
             
             # Check if index exists and has data
             if data_type not in self.indices or self.indices[data_type].ntotal == 0:
@@ -149,16 +348,24 @@ class VectorStore:
             
             # Get metadata from SQLite
             with self.Session() as session:
-                # Get all documents of this type
-                docs = session.query(Document).filter_by(data_type=data_type).all()
-                # Sort by similarity scores
+                # FAISS positions follow insertion order: resolve them against the
+                # document ids alone, then load metadata only for the matches
+                doc_ids = [doc_id for (doc_id,) in session.query(Document.id).filter_by(data_type=data_type)]
+                matches = [
+                    (doc_ids[idx], score)
+                    for idx, score in zip(I[0], D[0])
+                    if 0 <= idx < len(doc_ids)  # FAISS pads missing hits with -1
+                ]
+                docs = {
+                    doc.id: doc
+                    for doc in session.query(Document).filter(Document.id.in_([doc_id for doc_id, _ in matches]))
+                }
+                # Keep FAISS's similarity order
                 results = []
-                for idx, score in zip(I[0], D[0]):
-                    if idx < len(docs):  # Make sure we have metadata for this index
-                        doc = docs[idx]
-                        result = doc.doc_metadata.copy()
-                        result['similarity_score'] = float(score)
-                        results.append(result)
+                for doc_id, score in matches:
+                    result = docs[doc_id].doc_metadata.copy()
+                    result['similarity_score'] = float(score)
+                    results.append(result)
             
             return results
         except Exception as e:
@@ -1,5 +1,7 @@
+import atexit
 import os
-from flask import Flask, render_template, request, jsonify, session, send_from_directory
+from flask import Flask, render_template, request, jsonify, session, send_from_directory, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO
 from dotenv import load_dotenv
 import json
@@ -7,6 +9,11 @@ import uuid
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import custom modules
 from api.mcp_client import SimpleMCPClient
 from api.vector_store import VectorStore
@@ -21,8 +28,32 @@ os.makedirs(os.path.join(os.getcwd(), 'static'), exist_ok=True)
 os.makedirs(os.path.join(os.getcwd(), 'static', 'dashboards'), exist_ok=True)
 os.makedirs(os.path.join(os.getcwd(), 'data', 'vector_store'), exist_ok=True)
 
+# Seconds browsers may cache a served static dashboard
+DASHBOARD_MAX_AGE = int(os.getenv("DASHBOARD_MAX_AGE", 3600))
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; types orjson can't encode go through Flask's default"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__, static_folder='static')
-app.secret_key = os.urandom(24)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Sessions must survive restarts and be shared by every worker, so the key
+# comes from the environment; a random key only suits a single dev process
+app.secret_key = os.getenv("FLASK_SECRET_KEY")
+if not app.secret_key:
+    logging.warning("FLASK_SECRET_KEY not set. Using a random key; sessions will not survive restarts or be shared across workers.")
+    app.secret_key = os.urandom(24)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Initialize MCP client
@@ -93,7 +124,12 @@ def index():
         session['session_id'] = str(uuid.uuid4())
         session['conversation_history'] = []
     
-    return render_template('index.html')
+    # The page shell is the same for every visitor; let browsers revalidate
+    # it with If-None-Match and get a 304 instead of the full HTML
+    response = make_response(render_template('index.html'))
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -206,14 +242,19 @@ def serve_dashboard(dashboard_id):
     Serve a static dashboard HTML file.
     """
     try:
-        return send_from_directory(os.path.join(app.static_folder, 'dashboards'), f"{dashboard_id}.html")
+        # Dashboard files are written once under a fresh uuid and never rewritten,
+        # so browsers can reuse them instead of refetching on every view
+        return send_from_directory(os.path.join(app.static_folder, 'dashboards'), f"{dashboard_id}.html",
+                                   max_age=DASHBOARD_MAX_AGE)
     except Exception as e:
         logging.error(f"Error serving dashboard {dashboard_id}: {str(e)}")
         return f"Dashboard not found: {dashboard_id}", 404
 
-# Clean up resources when the app is shutting down
-@app.teardown_appcontext
-def cleanup_resources(exception=None):
+# Clean up resources when the app is shutting down. This must not run per
+# request (teardown_appcontext): tearing the client down after every request
+# stopped the spawned MCP server and forced a reconnect on the next chat.
+@atexit.register
+def cleanup_resources():
     if mcp_client:
         try:
             mcp_client.cleanup()
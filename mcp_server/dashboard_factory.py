@@ -1,16 +1,35 @@
 from typing import Dict, Any, List
-import plotly.graph_objects as go
-import plotly.express as px
+import logging
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+from utils.content_cache import TTLCache, content_digest
+
+# Processed data and layouts are cached by content, so identical raw data
+# (e.g. several viewers auto-refreshing one dashboard) is only processed once
+DASHBOARD_CACHE_TTL = 300
+DASHBOARD_CACHE_MAXSIZE = 512
+
+_processed_data_cache = TTLCache(DASHBOARD_CACHE_MAXSIZE, DASHBOARD_CACHE_TTL)
+_layout_cache = TTLCache(DASHBOARD_CACHE_MAXSIZE, DASHBOARD_CACHE_TTL)
 
 class DashboardFactory:
     """Factory class for creating different types of dashboards"""
     
     @staticmethod
     def create_dashboard(dashboard_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a dashboard based on type"""
+        """Create a dashboard based on type (cached by content; treat the result as read-only)"""
+        key = content_digest(data, dashboard_type)
+        if key is not None:
+            layout = _layout_cache.get(key)
+            if layout is not None:
+                return layout
+        
+        layout = DashboardFactory._create_dashboard(dashboard_type, data)
+        if key is not None:
+            _layout_cache.put(key, layout)
+        return layout
+    
+    @staticmethod
+    def _create_dashboard(dashboard_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         if dashboard_type == 'cbg':
             return CBGDashboard.generate_layout(data)
         elif dashboard_type == 'solar_farm':
@@ -215,7 +234,19 @@ class HybridPlantDashboard(DashboardBase):
         return layout
 
 def process_dashboard_data(raw_data: Dict[str, Any], dashboard_type: str) -> Dict[str, Any]:
-    """Process raw data for dashboard visualization"""
+    """Process raw data for dashboard visualization (cached by content; treat the result as read-only)"""
+    key = content_digest(raw_data, dashboard_type)
+    if key is not None:
+        processed_data = _processed_data_cache.get(key)
+        if processed_data is not None:
+            return processed_data
+    
+    processed_data = _process_dashboard_data(raw_data, dashboard_type)
+    if processed_data is not None and key is not None:
+        _processed_data_cache.put(key, processed_data)
+    return processed_data
+
+def _process_dashboard_data(raw_data: Dict[str, Any], dashboard_type: str) -> Dict[str, Any]:
     processed_data = {}
     
     try:
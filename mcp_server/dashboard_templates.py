@@ -1,7 +1,3 @@
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-
 class DashboardTemplate:
     """Base class for dashboard templates"""
     def __init__(self):
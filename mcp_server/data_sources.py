@@ -6,10 +6,76 @@ import logging
 import numpy as np
 from bs4 import BeautifulSoup
 import json
+import time
 import aiohttp
 import asyncio
+import contextvars
+from collections import OrderedDict
+from urllib.parse import urlencode
 from .vector_store import VectorStore
 
+# Pooled aiohttp session for the fetch in progress, set by DataAggregator
+_http_session = contextvars.ContextVar("_http_session", default=None)
+
+def _get_json(url, **kwargs):
+    """Blocking GET returning the decoded JSON body; async callers run it via asyncio.to_thread"""
+    response = requests.get(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+async def _fetch_json(url, params=None, headers=None):
+    """GET a JSON body, over the pooled aiohttp session when one is active"""
+    session = _http_session.get()
+    if session is None:
+        return await asyncio.to_thread(_get_json, url, params=params, headers=headers)
+    
+    # Encode the query the way requests does: lists repeat the key, None is dropped
+    if params:
+        query = urlencode([(k, v) for k, v in params.items() if v is not None], doseq=True)
+        url = f"{url}?{query}"
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        return await response.json(content_type=None)
+
+def _iso_timestamps(dates):
+    """Timestamp.isoformat() strings for a DatetimeIndex, formatted in one vectorized pass when naive"""
+    if dates.tz is not None:
+        return [d.isoformat() for d in dates]
+    if (dates.nanosecond != 0).any():
+        unit = "ns"
+    elif (dates.microsecond != 0).any():
+        unit = "us"
+    else:
+        unit = "s"
+    return np.datetime_as_string(dates.values, unit=unit).tolist()
+
+# One hour as a microsecond timedelta, the step of the hourly mock series
+_HOUR = np.timedelta64(3600 * 10**6, "us")
+
+def _hourly_timestamps(start_date, end_date):
+    """
+    isoformat() strings for every hour from start_date through end_date, the
+    same series as pd.date_range(freq='H'). Naive ISO input is parsed with
+    fromisoformat and ranged in NumPy; anything else goes through pandas.
+    """
+    try:
+        start = datetime.fromisoformat(start_date)
+        end = datetime.fromisoformat(end_date)
+    except (TypeError, ValueError):
+        start = end = None
+    if start is None or start.tzinfo is not None or end.tzinfo is not None:
+        dates = pd.date_range(start=pd.to_datetime(start_date), end=pd.to_datetime(end_date), freq='H')
+        return _iso_timestamps(dates)
+    
+    # Every step is whole hours, so all entries share the start's sub-second part
+    dates = np.arange(np.datetime64(start, "us"), np.datetime64(end, "us") + 1, _HOUR)
+    return np.datetime_as_string(dates, unit="us" if start.microsecond else "s").tolist()
+
+def _rows_to_columns(rows):
+    """Columnar form of row dicts: one list per field, aligned by index, None where a row lacks the field"""
+    fields = dict.fromkeys(field for row in rows for field in row)
+    return {field: [row.get(field) for row in rows] for field in fields}
+
 class WebDataSource:
     """Web scraping fallback for renewable energy data"""
     
@@ -21,42 +87,55 @@ class WebDataSource:
     async def search_web(query):
         """Generic web search function"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Use DuckDuckGo's HTML API (no API key needed)
-                url = f"https://html.duckduckgo.com/html/"
-                params = {
-                    "q": query,
-                    "kl": "us-en",  # Language/region
-                    "k1": "-1"      # Safe search off
-                }
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                
-                async with session.post(url, data=params, headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        results = []
-                        
-                        # Extract search results
-                        for result in soup.select('.result'):
-                            title = result.select_one('.result__title')
-                            snippet = result.select_one('.result__snippet')
-                            if title and snippet:
-                                results.append({
-                                    'title': title.get_text(strip=True),
-                                    'snippet': snippet.get_text(strip=True)
-                                })
-                        
-                        return results[:5]  # Return top 5 results
-                    else:
-                        logging.warning(f"Web search failed with status: {response.status}")
-                        return None
+            # Reuse the aggregator's pooled session when there is one
+            session = _http_session.get()
+            if session is None:
+                async with aiohttp.ClientSession() as session:
+                    return await WebDataSource._search_web(session, query)
+            return await WebDataSource._search_web(session, query)
         except Exception as e:
             logging.error(f"Error during web search: {str(e)}")
             return None
 
+    @staticmethod
+    async def _search_web(session, query):
+        # Use DuckDuckGo's HTML API (no API key needed)
+        url = f"https://html.duckduckgo.com/html/"
+        params = {
+            "q": query,
+            "kl": "us-en",  # Language/region
+            "k1": "-1"      # Safe search off
+        }
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+        
+        async with session.post(url, data=params, headers=headers) as response:
+            if response.status == 200:
+                html = await response.text()
+                # BeautifulSoup parsing is CPU-bound; keep it off the event loop
+                return await asyncio.to_thread(WebDataSource._parse_search_results, html)
+            else:
+                logging.warning(f"Web search failed with status: {response.status}")
+                return None
+
+    @staticmethod
+    def _parse_search_results(html):
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        
+        # Extract search results
+        for result in soup.select('.result'):
+            title = result.select_one('.result__title')
+            snippet = result.select_one('.result__snippet')
+            if title and snippet:
+                results.append({
+                    'title': title.get_text(strip=True),
+                    'snippet': snippet.get_text(strip=True)
+                })
+        
+        return results[:5]  # Return top 5 results
+
     @staticmethod
     async def fetch_eia_data(query_params):
         """Fetch EIA data from public sources"""
@@ -71,7 +150,7 @@ class WebDataSource:
             if similar_data:
                 logging.info("Found relevant EIA data in vector store")
                 return {
-                    "data": [item["data"] for item in similar_data],
+                    "data": _rows_to_columns([item["data"] for item in similar_data]),
                     "source": "vector_store"
                 }
             
@@ -104,7 +183,7 @@ class WebDataSource:
                 await self.vector_store.store_data("eia", data)
             
             return {
-                "data": data,
+                "data": _rows_to_columns(data),
                 "source": "web_scraping",
                 "period": f"{start_date} to {end_date}"
             }
@@ -128,7 +207,7 @@ class WebDataSource:
             if similar_data:
                 logging.info("Found relevant solar data in vector store")
                 return {
-                    "data": [item["data"] for item in similar_data],
+                    "data": _rows_to_columns([item["data"] for item in similar_data]),
                     "source": "vector_store"
                 }
             
@@ -160,7 +239,7 @@ class WebDataSource:
                 await self.vector_store.store_data("solar", data)
             
             return {
-                "data": data,
+                "data": _rows_to_columns(data),
                 "source": "web_scraping",
                 "location": {"latitude": lat, "longitude": lon}
             }
@@ -183,7 +262,7 @@ class WebDataSource:
             if similar_data:
                 logging.info("Found relevant wind data in vector store")
                 return {
-                    "data": [item["data"] for item in similar_data],
+                    "data": _rows_to_columns([item["data"] for item in similar_data]),
                     "source": "vector_store"
                 }
             
@@ -215,7 +294,7 @@ class WebDataSource:
                 await self.vector_store.store_data("wind", data)
             
             return {
-                "data": data,
+                "data": _rows_to_columns(data),
                 "source": "web_scraping",
                 "region": country
             }
@@ -228,10 +307,18 @@ class DataSource:
         self.api_key = api_key
         self.web_source = WebDataSource()
 
-    async def fetch_data(self, query_params):
-        """Base method to be implemented by specific data sources"""
+    async def fetch_live(self, query_params):
+        """Fetch from the API or web sources; None if every live path failed. Implemented by specific data sources"""
         raise NotImplementedError
 
+    async def fetch_data(self, query_params):
+        """Fetch live data, falling back to mock data when every live path fails"""
+        data = await self.fetch_live(query_params)
+        if data:
+            return data
+        logging.info(f"Live fetch failed, using mock data for {type(self).__name__}")
+        return await asyncio.to_thread(self._generate_mock_data, query_params)
+
 class OpenEnergyData(DataSource):
     """Integration with Open Energy Data Initiative API"""
     def __init__(self):
@@ -241,7 +328,7 @@ class OpenEnergyData(DataSource):
         if not self.api_key:
             logging.warning("EIA_API_KEY not found in environment variables. Will try web scraping, then fall back to mock data.")
 
-    async def fetch_data(self, query_params):
+    async def fetch_live(self, query_params):
         try:
             if not self.api_key:
                 # Try web scraping first
@@ -250,8 +337,8 @@ class OpenEnergyData(DataSource):
                     logging.info("Successfully fetched EIA data from web scraping")
                     return web_data
                 
-                logging.info("Web scraping failed, using mock data for EIA")
-                return self._generate_mock_data(query_params)
+                logging.info("Web scraping failed for EIA")
+                return None
 
             # Get renewable energy generation data
             endpoint = f"{self.base_url}/electricity/facility-fuel/data"
@@ -265,10 +352,7 @@ class OpenEnergyData(DataSource):
                 "sort": [{"column": "period", "direction": "desc"}]
             }
             
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            
-            return response.json()
+            return await _fetch_json(endpoint, params=params)
         except Exception as e:
             logging.error(f"Error fetching data from EIA: {str(e)}")
             # Try web scraping as fallback
@@ -277,25 +361,24 @@ class OpenEnergyData(DataSource):
                 logging.info("Successfully fetched EIA data from web scraping")
                 return web_data
             
-            logging.info("Web scraping failed, falling back to mock data for EIA")
-            return self._generate_mock_data(query_params)
+            logging.info("Web scraping failed for EIA")
+            return None
 
     def _generate_mock_data(self, query_params):
-        """Generate mock data for EIA"""
+        """Generate mock data for EIA (columnar: one field per key, aligned by index)"""
         start_date = pd.to_datetime(query_params.get("start_date"))
         end_date = pd.to_datetime(query_params.get("end_date"))
         dates = pd.date_range(start=start_date, end=end_date, freq='M')
         
+        fuels = ["SUN", "WND", "HYC"]
+        periods = dates.strftime("%Y-%m").repeat(len(fuels))
+        
         return {
-            "data": [
-                {
-                    "period": d.strftime("%Y-%m"),
-                    "generation": np.random.normal(1000, 100),
-                    "fuel": fuel
-                }
-                for d in dates
-                for fuel in ["SUN", "WND", "HYC"]
-            ]
+            "data": {
+                "period": periods.tolist(),
+                "generation": np.random.default_rng().normal(1000, 100, len(periods)),
+                "fuel": fuels * len(dates)
+            }
         }
 
 class SolarGIS(DataSource):
@@ -307,7 +390,7 @@ class SolarGIS(DataSource):
         if not self.api_key:
             logging.warning("SOLARGIS_API_KEY not found in environment variables. Will try web scraping, then fall back to mock data.")
 
-    async def fetch_data(self, query_params):
+    async def fetch_live(self, query_params):
         try:
             if not self.api_key:
                 # Try web scraping first
@@ -316,8 +399,8 @@ class SolarGIS(DataSource):
                     logging.info("Successfully fetched solar data from web scraping")
                     return web_data
                 
-                logging.info("Web scraping failed, using mock data for SolarGIS")
-                return self._generate_mock_data(query_params)
+                logging.info("Web scraping failed for SolarGIS")
+                return None
 
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -334,10 +417,7 @@ class SolarGIS(DataSource):
                 "endDate": query_params.get("end_date")
             }
             
-            response = requests.get(endpoint, headers=headers, params=params)
-            response.raise_for_status()
-            
-            return response.json()
+            return await _fetch_json(endpoint, headers=headers, params=params)
         except Exception as e:
             logging.error(f"Error fetching data from SolarGIS: {str(e)}")
             # Try web scraping as fallback
@@ -346,28 +426,26 @@ class SolarGIS(DataSource):
                 logging.info("Successfully fetched solar data from web scraping")
                 return web_data
             
-            logging.info("Web scraping failed, falling back to mock data for SolarGIS")
-            return self._generate_mock_data(query_params)
+            logging.info("Web scraping failed for SolarGIS")
+            return None
 
     def _generate_mock_data(self, query_params):
-        """Generate mock data for SolarGIS"""
-        start_date = pd.to_datetime(query_params.get("start_date"))
-        end_date = pd.to_datetime(query_params.get("end_date"))
-        dates = pd.date_range(start=start_date, end=end_date, freq='H')
+        """Generate mock data for SolarGIS (columnar: one field per key, aligned by index)"""
+        timestamps = _hourly_timestamps(query_params.get("start_date"), query_params.get("end_date"))
+        
+        rng = np.random.default_rng()
+        n = len(timestamps)
         
         return {
-            "current_generation": np.random.normal(800, 50),
+            "current_generation": float(rng.normal(800, 50)),
             "capacity": 1000,
-            "data": [
-                {
-                    "timestamp": d.isoformat(),
-                    "ghi": np.random.normal(500, 50),
-                    "dni": np.random.normal(700, 70),
-                    "temp": np.random.normal(25, 5),
-                    "pvout": np.random.normal(400, 40)
-                }
-                for d in dates
-            ]
+            "data": {
+                "timestamp": timestamps,
+                "ghi": rng.normal(500, 50, n),
+                "dni": rng.normal(700, 70, n),
+                "temp": rng.normal(25, 5, n),
+                "pvout": rng.normal(400, 40, n)
+            }
         }
 
 class WindEurope(DataSource):
@@ -379,7 +457,7 @@ class WindEurope(DataSource):
         if not self.api_key:
             logging.warning("WINDEUROPE_API_KEY not found in environment variables. Will try web scraping, then fall back to mock data.")
 
-    async def fetch_data(self, query_params):
+    async def fetch_live(self, query_params):
         try:
             if not self.api_key:
                 # Try web scraping first
@@ -388,8 +466,8 @@ class WindEurope(DataSource):
                     logging.info("Successfully fetched wind data from web scraping")
                     return web_data
                 
-                logging.info("Web scraping failed, using mock data for WindEurope")
-                return self._generate_mock_data(query_params)
+                logging.info("Web scraping failed for WindEurope")
+                return None
 
             headers = {
                 "X-API-Key": self.api_key,
@@ -404,10 +482,7 @@ class WindEurope(DataSource):
                 "resolution": "hourly"
             }
             
-            response = requests.get(endpoint, headers=headers, params=params)
-            response.raise_for_status()
-            
-            return response.json()
+            return await _fetch_json(endpoint, headers=headers, params=params)
         except Exception as e:
             logging.error(f"Error fetching data from WindEurope: {str(e)}")
             # Try web scraping as fallback
@@ -416,26 +491,24 @@ class WindEurope(DataSource):
                 logging.info("Successfully fetched wind data from web scraping")
                 return web_data
             
-            logging.info("Web scraping failed, falling back to mock data for WindEurope")
-            return self._generate_mock_data(query_params)
+            logging.info("Web scraping failed for WindEurope")
+            return None
 
     def _generate_mock_data(self, query_params):
-        """Generate mock data for WindEurope"""
-        start_date = pd.to_datetime(query_params.get("start_date"))
-        end_date = pd.to_datetime(query_params.get("end_date"))
-        dates = pd.date_range(start=start_date, end=end_date, freq='H')
+        """Generate mock data for WindEurope (columnar: one field per key, aligned by index)"""
+        timestamps = _hourly_timestamps(query_params.get("start_date"), query_params.get("end_date"))
+        
+        rng = np.random.default_rng()
+        n = len(timestamps)
         
         return {
-            "data": [
-                {
-                    "timestamp": d.isoformat(),
-                    "generation": np.random.normal(600, 60),
-                    "capacity": 800,
-                    "wind_speed": np.random.normal(8, 2),
-                    "direction": np.random.randint(0, 360)
-                }
-                for d in dates
-            ]
+            "capacity": 800,
+            "data": {
+                "timestamp": timestamps,
+                "generation": rng.normal(600, 60, n),
+                "wind_speed": rng.normal(8, 2, n),
+                "direction": rng.integers(0, 360, n)
+            }
         }
 
 class RESTrendAnalyzer:
@@ -476,42 +549,247 @@ class RESTrendAnalyzer:
             logging.error(f"Error analyzing generation trends: {str(e)}")
             return None
 
+class _CircuitBreaker:
+    """
+    Closed -> open after fail_threshold consecutive failures. While open, calls
+    are refused until the reset timeout passes; then one probe is let through
+    (half-open). A failed probe reopens the breaker with the timeout doubled,
+    up to max_reset_timeout; a success closes it again. An abandoned probe
+    (cancelled before it finished) reopens it without a penalty, so the next
+    call probes again.
+    """
+    def __init__(self, name, fail_threshold=5, reset_timeout=30, max_reset_timeout=300):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.reset_timeout = reset_timeout
+        self.opened_at = 0.0
+
+    def allow(self):
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        if self.state == "half_open":
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open()
+            return
+        self.failures += 1
+        if self.failures >= self.fail_threshold:
+            self._open()
+
+    def release(self):
+        if self.state == "half_open":
+            self.state = "open"
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        logging.warning(f"Circuit for {self.name} opened for {self.reset_timeout}s")
+
 class DataAggregator:
     """Aggregates and processes data from multiple sources"""
-    def __init__(self):
+    # Seconds a completed result is reused for an identical query
+    RESULT_TTL = 5
+    # Upper bound on aggregations running against upstream sources at once
+    MAX_CONCURRENT_FETCHES = 64
+    # Number of (source, query) pairs whose last live result is kept for when
+    # the source's circuit is open
+    LAST_GOOD_MAXSIZE = 256
+    # Connection pool size for the aggregator's own HTTP session, overall and per upstream host
+    HTTP_POOL_LIMIT = 100
+    HTTP_POOL_LIMIT_PER_HOST = 20
+
+    def __init__(self, session=None):
         self.data_sources = {
             "eia": OpenEnergyData(),
             "solargis": SolarGIS(),
             "windeurope": WindEurope()
         }
         self.analyzer = RESTrendAnalyzer()
+        # (event loop, query key) -> task for a fetch in progress
+        self._inflight = {}
+        # query key -> (expires_at, result) for recently completed fetches
+        self._recent = {}
+        # Pooled HTTP session shared by every source. A session passed in is
+        # owned by the caller; otherwise one is created on first fetch.
+        self.session = session
+        self._owns_session = session is None
+        self._session_loop = None
+        self._fetch_semaphore = None
+        self._semaphore_loop = None
+        # One breaker per upstream source, fed by that source's live fetches
+        self._breakers = {name: _CircuitBreaker(name) for name in self.data_sources}
+        # (source name, query key) -> last live result, served while that
+        # source's circuit is open
+        self._last_good = OrderedDict()
+
+    async def _get_session(self):
+        """Return the pooled aiohttp session for the running loop, creating it if needed"""
+        if not self._owns_session:
+            return self.session
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._session_loop is not loop:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.HTTP_POOL_LIMIT,
+                    limit_per_host=self.HTTP_POOL_LIMIT_PER_HOST,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                )
+            )
+            self._session_loop = loop
+        return self.session
+
+    async def close(self):
+        """Close the pooled HTTP session (a session passed in by the caller is left open)"""
+        if not self._owns_session:
+            return
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
     async def fetch_comprehensive_data(self, query):
         """
         Fetch and aggregate data from all available sources
         
+        Concurrent calls with the same query share a single fetch, and a
+        completed result is reused for RESULT_TTL seconds. Callers receive
+        the same dict and should not mutate it.
+        
         Args:
             query (dict): Query parameters including:
                 - start_date
                 - end_date
                 - location (lat/long or country)
                 - data_types (list of required data types)
+        
+        Returns:
+            dict: One entry per source name, plus "analysis". A source's
+            "data" from web scraping, the vector store or mock generation is
+            columnar: field name -> list or numpy array, all aligned by row
+            index. A live API response is passed through in the provider's
+            own format.
         """
+        key = json.dumps(query, sort_keys=True, default=str)
+        now = time.monotonic()
+        
+        recent = self._recent.get(key)
+        if recent is not None:
+            if recent[0] > now:
+                return recent[1]
+            del self._recent[key]
+        
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get((loop, key))
+        if task is None:
+            task = loop.create_task(self._guarded_fetch(query, key))
+            self._inflight[(loop, key)] = task
+            task.add_done_callback(lambda t: self._fetch_done(loop, key, t))
+        
+        # Shield so one cancelled caller doesn't cancel the fetch for the rest
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, loop, key, task):
+        self._inflight.pop((loop, key), None)
+        if not task.cancelled() and task.exception() is None and task.result():
+            now = time.monotonic()
+            # Drop expired entries so distinct one-off queries don't accumulate
+            self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+            self._recent[key] = (now + self.RESULT_TTL, task.result())
+
+    async def _guarded_fetch(self, query, key):
+        """Run an aggregation under the concurrency cap"""
+        loop = asyncio.get_running_loop()
+        if self._fetch_semaphore is None or self._semaphore_loop is not loop:
+            self._fetch_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FETCHES)
+            self._semaphore_loop = loop
+        
+        async with self._fetch_semaphore:
+            return await self._fetch_comprehensive_data(query, key)
+
+    async def _fetch_source(self, source_name, source, query_params, key):
+        """
+        Fetch one source through its circuit breaker. While the circuit is
+        open, the source's last live result for this query (or its mock data)
+        is served without calling upstream.
+        """
+        breaker = self._breakers[source_name]
+        if breaker.allow():
+            try:
+                data = await source.fetch_live(query_params)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception:
+                breaker.record_failure()
+                raise
+            if data:
+                breaker.record_success()
+                self._last_good[(source_name, key)] = data
+                self._last_good.move_to_end((source_name, key))
+                while len(self._last_good) > self.LAST_GOOD_MAXSIZE:
+                    self._last_good.popitem(last=False)
+                return data
+            breaker.record_failure()
+        else:
+            data = self._last_good.get((source_name, key))
+            if data is not None:
+                logging.warning(f"Circuit for {source_name} is open, serving last known data")
+                return data
+        
+        logging.info(f"No live data from {source_name}, using mock data")
+        return await asyncio.to_thread(source._generate_mock_data, query_params)
+
+    async def _fetch_comprehensive_data(self, query, key):
         try:
+            # Runs in its own task, so this only affects this fetch's sources
+            _http_session.set(await self._get_session())
             all_data = {}
             
-            # Prepare query parameters
+            # Prepare query parameters; the default window is the last 30 days
+            start_date = query.get("start_date")
+            end_date = query.get("end_date")
+            if start_date is None or end_date is None:
+                now = datetime.now()
+                if start_date is None:
+                    start_date = (now - timedelta(days=30)).isoformat()
+                if end_date is None:
+                    end_date = now.isoformat()
+            
             query_params = {
-                "start_date": query.get("start_date", (datetime.now() - timedelta(days=30)).isoformat()),
-                "end_date": query.get("end_date", datetime.now().isoformat()),
+                "start_date": start_date,
+                "end_date": end_date,
                 "latitude": query.get("latitude"),
                 "longitude": query.get("longitude"),
                 "country": query.get("country")
             }
             
-            # Fetch data from each source
-            for source_name, source in self.data_sources.items():
-                source_data = await source.fetch_data(query_params)
+            # Fetch from every source concurrently; one failing source falls
+            # back to its mock data instead of failing the whole aggregation
+            results = await asyncio.gather(
+                *(
+                    self._fetch_source(source_name, source, query_params, key)
+                    for source_name, source in self.data_sources.items()
+                ),
+                return_exceptions=True
+            )
+            for (source_name, source), source_data in zip(self.data_sources.items(), results):
+                if isinstance(source_data, Exception):
+                    logging.error(f"Error fetching data from {source_name}: {str(source_data)}")
+                    source_data = await asyncio.to_thread(source._generate_mock_data, query_params)
                 if source_data:
                     all_data[source_name] = source_data
             
@@ -1,23 +1,63 @@
 #!/usr/bin/env python3
-import asyncio
+import atexit
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
-import random
+import queue
+import signal
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Any, Optional, Tuple, Union
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from logging.handlers import QueueHandler, QueueListener
 import threading
 import time
 
-# Configure logging
+import numpy as np
+from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+# Configure logging: request threads only enqueue records, and a background
+# listener thread does the actual writes to stdout
+_log_queue = queue.Queue(maxsize=10000)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
+    handlers=[_DroppingQueueHandler(_log_queue)]
 )
 
+# Read .env once at startup, before any settings below are taken from the environment
+load_dotenv()
+
+# Request limits for the HTTP handler
+MAX_BODY_BYTES = int(os.getenv("MCP_MAX_BODY_BYTES", 64 * 1024))
+MAX_IN_FLIGHT_REQUESTS = int(os.getenv("MCP_MAX_IN_FLIGHT_REQUESTS", 64))
+_in_flight_requests = threading.BoundedSemaphore(MAX_IN_FLIGHT_REQUESTS)
+
+# Worker processes started by run_server (limits above apply per worker);
+# one by default, since app.py runs this server as a helper process
+MCP_WORKERS = int(os.getenv("MCP_WORKERS", 1))
+
 # Tool definitions
 TOOLS = [
     {
@@ -140,6 +180,313 @@ TOOLS = [
     }
 ]
 
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for the stdlib path: numpy arrays and scalars via tolist()"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode()
+
+def _json_loads(data: Union[bytes, bytearray]) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# (epoch second, ISO-8601 string) of the last response timestamp formatted
+_timestamp_cache = (0, "")
+
+def _timestamp_iso() -> str:
+    """Current local time as ISO-8601 at second resolution, formatted at most once per second"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, cached = _timestamp_cache
+    if second != cached_second:
+        cached = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, cached)
+    return cached
+
+def _now_iso() -> Tuple[datetime, str]:
+    """Read the clock once and return it alongside its ISO-8601 form"""
+    now = datetime.now()
+    return now, now.isoformat()
+
+# create_dashboard response body; every %s slot takes an already JSON-encoded value
+_DASHBOARD_RESPONSE_TEMPLATE = (
+    b'{"status":"success","dashboard_id":%s,"dashboard_type":%s,"title":%s,'
+    b'"description":%s,"url":%s,"created_at":"%s","message":%s}'
+)
+
+# Monotonic source of dashboard ID suffixes; seeded from the clock so IDs
+# from separate runs do not overlap in practice
+_dashboard_counter = itertools.count(int(time.time()))
+
+# (base_value, variance) of the mock generation series per energy type
+_ENERGY_PROFILES = {
+    "solar": (100, 30),
+    "wind": (150, 50),
+    "hydro": (200, 20),
+    "geothermal": (80, 10),
+    "biogas": (60, 15),
+    "cbg": (60, 15)
+}
+_DEFAULT_ENERGY_PROFILE = (50, 20)
+
+def _solar_shape(rng: np.random.Generator) -> Dict[str, Any]:
+    return {
+        "capacity": rng.uniform(500, 2000),
+        "efficiency": rng.uniform(0.15, 0.25),
+        "panel_count": int(rng.integers(1000, 5001))
+    }
+
+def _wind_shape(rng: np.random.Generator) -> Dict[str, Any]:
+    return {
+        "capacity": rng.uniform(800, 3000),
+        "turbine_count": int(rng.integers(10, 51)),
+        "average_wind_speed": rng.uniform(5, 15)
+    }
+
+def _biogas_shape(rng: np.random.Generator) -> Dict[str, Any]:
+    return {
+        "feedstock": {
+            "organic_waste": rng.uniform(100, 500),
+            "agricultural_waste": rng.uniform(50, 300),
+            "food_waste": rng.uniform(30, 200)
+        },
+        "methane_content": rng.uniform(50, 70),
+        "community_participants": int(rng.integers(5, 51))
+    }
+
+def _default_shape(rng: np.random.Generator) -> Dict[str, Any]:
+    return {
+        "capacity": rng.uniform(300, 1500),
+        "efficiency": rng.uniform(0.1, 0.4)
+    }
+
+# Extra mock fields returned alongside the generation series per energy type
+_ENERGY_SHAPES = {
+    "solar": _solar_shape,
+    "wind": _wind_shape,
+    "biogas": _biogas_shape,
+    "cbg": _biogas_shape
+}
+
+# Static mock datasets, built once at import and shared by every request
+_US_COUNTRY_NAMES = frozenset({"us", "usa", "united states"})
+_EU_COUNTRY_NAMES = frozenset({"eu", "european union"})
+
+_US_POLICIES = (
+    {
+        "name": "Federal Investment Tax Credit (ITC)",
+        "type": "tax_incentives",
+        "description": "Tax credit for solar, wind, and geothermal installations",
+        "benefit": "26% tax credit for projects that begin construction in 2022",
+        "eligibility": "Residential and commercial properties",
+        "expiration": "Phases down to 22% in 2023, 10% in 2024 for commercial only"
+    },
+    {
+        "name": "Modified Accelerated Cost Recovery System (MACRS)",
+        "type": "tax_incentives",
+        "description": "Depreciation deduction for renewable energy properties",
+        "benefit": "5-year depreciation schedule for most renewable technologies",
+        "eligibility": "Business owners who install renewable energy systems"
+    },
+    {
+        "name": "Renewable Portfolio Standards (RPS)",
+        "type": "regulations",
+        "description": "State-level requirements for renewable energy procurement",
+        "benefit": "Creates market demand for renewable energy",
+        "eligibility": "Varies by state"
+    }
+)
+
+_CA_POLICIES = (
+    {
+        "name": "California Solar Initiative (CSI)",
+        "type": "subsidies",
+        "description": "Rebates for solar installations",
+        "benefit": "Varies based on system size and performance",
+        "eligibility": "California residents and businesses"
+    },
+    {
+        "name": "Net Energy Metering (NEM)",
+        "type": "regulations",
+        "description": "Credit for excess electricity sent to the grid",
+        "benefit": "Retail rate compensation for excess generation",
+        "eligibility": "California utility customers with renewable systems"
+    }
+)
+
+_US_CA_POLICIES = _US_POLICIES + _CA_POLICIES
+
+_EU_POLICIES = (
+    {
+        "name": "Renewable Energy Directive (RED II)",
+        "type": "regulations",
+        "description": "Sets targets for renewable energy consumption",
+        "benefit": "32% renewable energy target by 2030",
+        "eligibility": "All EU member states"
+    },
+    {
+        "name": "European Green Deal",
+        "type": "funding",
+        "description": "Investment plan for sustainable EU economy",
+        "benefit": "€1 trillion in sustainable investments over 10 years",
+        "eligibility": "Various stakeholders across EU member states"
+    }
+)
+
+_ALL_SEARCH = (
+    {
+        "title": "Solar PV Efficiency Breakthrough",
+        "category": "technology",
+        "summary": "New perovskite-silicon tandem solar cells achieve 29.8% efficiency",
+        "source": "Renewable Energy Journal",
+        "date": "2023-05-15"
+    },
+    {
+        "title": "Wind Farm Development in North Sea",
+        "category": "project",
+        "summary": "New 1.5 GW offshore wind farm to be developed off the coast of Denmark",
+        "source": "Wind Power Monthly",
+        "date": "2023-06-22"
+    },
+    {
+        "title": "Community Biogas Initiative in Rural India",
+        "category": "project",
+        "summary": "50 villages implement community-scale biogas plants for cooking and electricity",
+        "source": "Bioenergy International",
+        "date": "2023-04-10"
+    },
+    {
+        "title": "NextEra Energy Expands Renewable Portfolio",
+        "category": "company",
+        "summary": "Company announces 2.8 GW of new solar and wind projects",
+        "source": "Clean Energy Wire",
+        "date": "2023-07-05"
+    },
+    {
+        "title": "Geothermal Energy Potential in East Africa",
+        "category": "location",
+        "summary": "Study identifies 10 GW of untapped geothermal potential in East African Rift",
+        "source": "Geothermal Resources Council",
+        "date": "2023-03-18"
+    },
+    {
+        "title": "Hydrogen Production from Renewable Sources",
+        "category": "technology",
+        "summary": "Advances in electrolysis technology reduce green hydrogen production costs",
+        "source": "International Journal of Hydrogen Energy",
+        "date": "2023-02-28"
+    },
+    {
+        "title": "Battery Storage Integration with Renewable Energy",
+        "category": "technology",
+        "summary": "New battery management systems optimize renewable energy storage",
+        "source": "Energy Storage News",
+        "date": "2023-08-12"
+    }
+)
+
+# Lowercased "title, summary, category" text per row, parallel to _ALL_SEARCH.
+# Fields are NUL-separated so a query cannot match across field boundaries.
+_ALL_SEARCH_LC = tuple(
+    "\0".join((r["title"], r["summary"], r["category"])).lower() for r in _ALL_SEARCH
+)
+
+# Lowercased category -> indices into _ALL_SEARCH
+_CAT_INDEX: Dict[str, List[int]] = {}
+for _i, _row in enumerate(_ALL_SEARCH):
+    _CAT_INDEX.setdefault(_row["category"].lower(), []).append(_i)
+del _i, _row
+
+@functools.lru_cache(maxsize=512)
+def _get_mock_policies(country: str, region: str, policy_type: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Get mock policy data.
+    
+    Args:
+        country: Country for policy information
+        region: Region within the country
+        policy_type: Type of policy
+        
+    Returns:
+        Tuple of policy information (cached, must not be mutated)
+    """
+    country_lower = country.lower()
+    
+    # US policies, plus California-specific ones
+    if country_lower in _US_COUNTRY_NAMES:
+        policies = _US_CA_POLICIES if region.lower() == "california" else _US_POLICIES
+    
+    # EU policies
+    elif country_lower in _EU_COUNTRY_NAMES:
+        policies = _EU_POLICIES
+    
+    else:
+        policies = ()
+    
+    # Filter by policy type if specified (types are stored lowercase)
+    if policy_type:
+        policy_type_lower = policy_type.lower()
+        policies = tuple(p for p in policies if p["type"] == policy_type_lower)
+    
+    return policies
+
+@functools.lru_cache(maxsize=512)
+def _get_mock_search_results(query: str, filter_by: str, max_results: int) -> Tuple[Dict[str, Any], ...]:
+    """
+    Get mock search results.
+    
+    Args:
+        query: Search query
+        filter_by: Category to filter by
+        max_results: Maximum number of results to return
+        
+    Returns:
+        Tuple of search results (cached, must not be mutated)
+    """
+    # Filter by category if specified
+    if filter_by:
+        indices = _CAT_INDEX.get(filter_by.lower(), ())
+    else:
+        indices = range(len(_ALL_SEARCH))
+    
+    # Filter by query if specified
+    query_lower = query.lower()
+    results = [
+        _ALL_SEARCH[i] for i in indices
+        if not query_lower or query_lower in _ALL_SEARCH_LC[i]
+    ]
+    
+    # Limit results
+    return tuple(results[:max_results])
+
+# /tools never changes while the server runs, so serialize it once
+_TOOLS_BODY = _json_dumps({"tools": TOOLS})
+_TOOLS_ETAG = f'"{hashlib.md5(_TOOLS_BODY).hexdigest()}"'
+
+# Tools whose results depend only on their parameters and the static datasets
+_CACHEABLE_TOOLS = frozenset({"get_policy_information", "search_renewable_database"})
+_MOCK_DATA_DIGEST = hashlib.md5(
+    _json_dumps([_US_POLICIES, _CA_POLICIES, _EU_POLICIES, _ALL_SEARCH])
+).hexdigest()
+
+def _tool_etag(tool_name: str, parameters: Dict[str, Any]) -> str:
+    """
+    Build a weak ETag for a cacheable tool call.
+    
+    The response body carries a fresh timestamp, so the tag identifies the
+    tool, its parameters and the dataset version rather than the exact bytes.
+    """
+    key = repr((_MOCK_DATA_DIGEST, tool_name, sorted(parameters.items())))
+    return f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+
 class RenewableEnergyMCPServer:
     """
     MCP Server for the Renewable Energy Consultant.
@@ -150,6 +497,8 @@ class RenewableEnergyMCPServer:
     def __init__(self):
         """Initialize the server"""
         self.tools = TOOLS
+        # Per-instance generator so concurrent handlers share no RNG state
+        self._rng = np.random.default_rng()
     
     def handle_fetch_renewable_data(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -165,8 +514,10 @@ class RenewableEnergyMCPServer:
         location = params.get("location", "global")
         time_period = params.get("time_period", "last_month")
         
+        now, now_iso = _now_iso()
+        
         # Generate mock data based on energy type
-        data = self._generate_mock_data(energy_type, location, time_period)
+        data = self._generate_mock_data(energy_type, location, time_period, now)
         
         return {
             "status": "success",
@@ -174,10 +525,10 @@ class RenewableEnergyMCPServer:
             "location": location,
             "time_period": time_period,
             "data": data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         }
     
-    def handle_create_dashboard(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_create_dashboard(self, params: Dict[str, Any]) -> bytes:
         """
         Handle create_dashboard tool calls.
         
@@ -185,25 +536,24 @@ class RenewableEnergyMCPServer:
             params: Tool parameters
             
         Returns:
-            Dict containing the dashboard information
+            Pre-serialized JSON bytes containing the dashboard information
         """
         dashboard_type = params.get("dashboard_type", "cbg")
         title = params.get("title", f"Renewable Energy Dashboard - {dashboard_type.upper()}")
         description = params.get("description", f"Dashboard for {dashboard_type} data visualization")
         
         # Generate a unique dashboard ID
-        dashboard_id = f"{dashboard_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        
-        return {
-            "status": "success",
-            "dashboard_id": dashboard_id,
-            "dashboard_type": dashboard_type,
-            "title": title,
-            "description": description,
-            "url": f"/dashboards/{dashboard_id}",
-            "created_at": datetime.now().isoformat(),
-            "message": f"Dashboard '{title}' created successfully"
-        }
+        dashboard_id = f"{dashboard_type}_{next(_dashboard_counter):x}"
+        
+        return _DASHBOARD_RESPONSE_TEMPLATE % (
+            _json_dumps(dashboard_id),
+            _json_dumps(dashboard_type),
+            _json_dumps(title),
+            _json_dumps(description),
+            _json_dumps(f"/dashboards/{dashboard_id}"),
+            _timestamp_iso().encode(),
+            _json_dumps(f"Dashboard '{title}' created successfully")
+        )
     
     def handle_calculate_roi(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -248,7 +598,64 @@ class RenewableEnergyMCPServer:
             "total_profit": round(total_profit, 2),
             "roi_percentage": round(roi, 2),
             "estimated_irr_percentage": round(irr, 2),
-            "analysis_timestamp": datetime.now().isoformat()
+            "analysis_timestamp": _timestamp_iso()
+        }
+    
+    def handle_calculate_roi_batch(self, params_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Handle a batch of calculate_roi tool calls in one vectorized pass.
+        
+        Args:
+            params_list: List of tool parameters, one per project
+            
+        Returns:
+            Dict containing one ROI calculation result per project, in order
+        """
+        initial_investment = np.array([params.get("initial_investment", 100000) for params in params_list], dtype=float)
+        annual_revenue = np.array([params.get("annual_revenue", 20000) for params in params_list], dtype=float)
+        annual_costs = np.array([params.get("annual_costs", 5000) for params in params_list], dtype=float)
+        project_lifetime = np.array([params.get("project_lifetime", 25) for params in params_list], dtype=float)
+        
+        # Same failure mode as the single-project calculation
+        if (initial_investment == 0).any():
+            raise ZeroDivisionError("division by zero")
+        
+        net_annual_cash_flow = annual_revenue - annual_costs
+        with np.errstate(divide="ignore"):
+            payback_period = np.where(net_annual_cash_flow > 0, initial_investment / net_annual_cash_flow, np.inf)
+        total_profit = (net_annual_cash_flow * project_lifetime) - initial_investment
+        roi = (total_profit / initial_investment) * 100
+        irr = (net_annual_cash_flow / initial_investment) * 100
+        
+        analysis_timestamp = _timestamp_iso()
+        results = [
+            {
+                "status": "success",
+                "project_type": params.get("project_type", "solar"),
+                "initial_investment": params.get("initial_investment", 100000),
+                "annual_revenue": params.get("annual_revenue", 20000),
+                "annual_costs": params.get("annual_costs", 5000),
+                "project_lifetime": params.get("project_lifetime", 25),
+                "net_annual_cash_flow": params.get("annual_revenue", 20000) - params.get("annual_costs", 5000),
+                "payback_period_years": payback,
+                "total_profit": profit,
+                "roi_percentage": roi_percentage,
+                "estimated_irr_percentage": irr_percentage,
+                "analysis_timestamp": analysis_timestamp
+            }
+            for params, payback, profit, roi_percentage, irr_percentage in zip(
+                params_list,
+                payback_period.round(2).tolist(),
+                total_profit.round(2).tolist(),
+                roi.round(2).tolist(),
+                irr.round(2).tolist()
+            )
+        ]
+        
+        return {
+            "status": "success",
+            "results_count": len(results),
+            "results": results
         }
     
     def handle_get_policy_information(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -266,7 +673,7 @@ class RenewableEnergyMCPServer:
         policy_type = params.get("policy_type", "")
         
         # Mock policy data
-        policies = self._get_mock_policies(country, region, policy_type)
+        policies = _get_mock_policies(country, region, policy_type)
         
         return {
             "status": "success",
@@ -274,7 +681,7 @@ class RenewableEnergyMCPServer:
             "region": region or "All regions",
             "policy_type": policy_type or "All policies",
             "policies": policies,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": _timestamp_iso()
         }
     
     def handle_search_renewable_database(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -292,7 +699,7 @@ class RenewableEnergyMCPServer:
         max_results = params.get("max_results", 5)
         
         # Mock search results
-        results = self._get_mock_search_results(query, filter_by, max_results)
+        results = _get_mock_search_results(query, filter_by, max_results)
         
         return {
             "status": "success",
@@ -300,10 +707,11 @@ class RenewableEnergyMCPServer:
             "filter_by": filter_by or "All categories",
             "results_count": len(results),
             "results": results,
-            "search_timestamp": datetime.now().isoformat()
+            "search_timestamp": _timestamp_iso()
         }
     
-    def _generate_mock_data(self, energy_type: str, location: str, time_period: str) -> Dict[str, Any]:
+    def _generate_mock_data(self, energy_type: str, location: str, time_period: str,
+                            now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Generate mock data for renewable energy sources.
         
@@ -311,12 +719,13 @@ class RenewableEnergyMCPServer:
             energy_type: Type of renewable energy
             location: Geographic location
             time_period: Time period for the data
+            now: End of the generated series (defaults to the current time)
             
         Returns:
             Dict containing mock data
         """
         # Determine date range based on time period
-        end_date = datetime.now()
+        end_date = now or datetime.now()
         if time_period == "last_week":
             start_date = end_date - timedelta(days=7)
             interval = timedelta(days=1)
@@ -330,314 +739,243 @@ class RenewableEnergyMCPServer:
             start_date = end_date - timedelta(days=30)
             interval = timedelta(days=1)
         
-        # Generate time series data
-        time_series = []
-        current_date = start_date
-        while current_date <= end_date:
-            # Base value depends on energy type
-            if energy_type.lower() == "solar":
-                base_value = 100
-                variance = 30
-            elif energy_type.lower() == "wind":
-                base_value = 150
-                variance = 50
-            elif energy_type.lower() == "hydro":
-                base_value = 200
-                variance = 20
-            elif energy_type.lower() == "geothermal":
-                base_value = 80
-                variance = 10
-            elif energy_type.lower() == "biogas" or energy_type.lower() == "cbg":
-                base_value = 60
-                variance = 15
-            else:
-                base_value = 50
-                variance = 20
-            
-            # Add random variation
-            value = base_value + random.uniform(-variance, variance)
-            
-            time_series.append({
-                "timestamp": current_date.isoformat(),
-                "value": round(max(0, value), 2)
-            })
-            
-            current_date += interval
-        
-        # Create data structure based on energy type
-        if energy_type.lower() == "solar":
-            return {
-                "generation": time_series,
-                "capacity": random.uniform(500, 2000),
-                "efficiency": random.uniform(0.15, 0.25),
-                "panel_count": random.randint(1000, 5000)
-            }
-        elif energy_type.lower() == "wind":
-            return {
-                "generation": time_series,
-                "capacity": random.uniform(800, 3000),
-                "turbine_count": random.randint(10, 50),
-                "average_wind_speed": random.uniform(5, 15)
-            }
-        elif energy_type.lower() == "biogas" or energy_type.lower() == "cbg":
-            return {
-                "generation": time_series,
-                "feedstock": {
-                    "organic_waste": random.uniform(100, 500),
-                    "agricultural_waste": random.uniform(50, 300),
-                    "food_waste": random.uniform(30, 200)
-                },
-                "methane_content": random.uniform(50, 70),
-                "community_participants": random.randint(5, 50)
-            }
-        else:
-            return {
-                "generation": time_series,
-                "capacity": random.uniform(300, 1500),
-                "efficiency": random.uniform(0.1, 0.4)
-            }
-    
-    def _get_mock_policies(self, country: str, region: str, policy_type: str) -> List[Dict[str, Any]]:
-        """
-        Get mock policy data.
-        
-        Args:
-            country: Country for policy information
-            region: Region within the country
-            policy_type: Type of policy
-            
-        Returns:
-            List of policy information
-        """
-        policies = []
-        
-        # US policies
-        if country.lower() in ["us", "usa", "united states"]:
-            policies.extend([
-                {
-                    "name": "Federal Investment Tax Credit (ITC)",
-                    "type": "tax_incentives",
-                    "description": "Tax credit for solar, wind, and geothermal installations",
-                    "benefit": "26% tax credit for projects that begin construction in 2022",
-                    "eligibility": "Residential and commercial properties",
-                    "expiration": "Phases down to 22% in 2023, 10% in 2024 for commercial only"
-                },
-                {
-                    "name": "Modified Accelerated Cost Recovery System (MACRS)",
-                    "type": "tax_incentives",
-                    "description": "Depreciation deduction for renewable energy properties",
-                    "benefit": "5-year depreciation schedule for most renewable technologies",
-                    "eligibility": "Business owners who install renewable energy systems"
-                },
-                {
-                    "name": "Renewable Portfolio Standards (RPS)",
-                    "type": "regulations",
-                    "description": "State-level requirements for renewable energy procurement",
-                    "benefit": "Creates market demand for renewable energy",
-                    "eligibility": "Varies by state"
-                }
-            ])
-            
-            # California-specific policies
-            if region.lower() == "california":
-                policies.extend([
-                    {
-                        "name": "California Solar Initiative (CSI)",
-                        "type": "subsidies",
-                        "description": "Rebates for solar installations",
-                        "benefit": "Varies based on system size and performance",
-                        "eligibility": "California residents and businesses"
-                    },
-                    {
-                        "name": "Net Energy Metering (NEM)",
-                        "type": "regulations",
-                        "description": "Credit for excess electricity sent to the grid",
-                        "benefit": "Retail rate compensation for excess generation",
-                        "eligibility": "California utility customers with renewable systems"
-                    }
-                ])
-        
-        # EU policies
-        elif country.lower() in ["eu", "european union"]:
-            policies.extend([
-                {
-                    "name": "Renewable Energy Directive (RED II)",
-                    "type": "regulations",
-                    "description": "Sets targets for renewable energy consumption",
-                    "benefit": "32% renewable energy target by 2030",
-                    "eligibility": "All EU member states"
-                },
-                {
-                    "name": "European Green Deal",
-                    "type": "funding",
-                    "description": "Investment plan for sustainable EU economy",
-                    "benefit": "€1 trillion in sustainable investments over 10 years",
-                    "eligibility": "Various stakeholders across EU member states"
-                }
-            ])
-        
-        # Filter by policy type if specified
-        if policy_type:
-            policies = [p for p in policies if p["type"].lower() == policy_type.lower()]
-        
-        return policies
-    
-    def _get_mock_search_results(self, query: str, filter_by: str, max_results: int) -> List[Dict[str, Any]]:
-        """
-        Get mock search results.
-        
-        Args:
-            query: Search query
-            filter_by: Category to filter by
-            max_results: Maximum number of results to return
-            
-        Returns:
-            List of search results
-        """
-        all_results = [
-            {
-                "title": "Solar PV Efficiency Breakthrough",
-                "category": "technology",
-                "summary": "New perovskite-silicon tandem solar cells achieve 29.8% efficiency",
-                "source": "Renewable Energy Journal",
-                "date": "2023-05-15"
-            },
-            {
-                "title": "Wind Farm Development in North Sea",
-                "category": "project",
-                "summary": "New 1.5 GW offshore wind farm to be developed off the coast of Denmark",
-                "source": "Wind Power Monthly",
-                "date": "2023-06-22"
-            },
-            {
-                "title": "Community Biogas Initiative in Rural India",
-                "category": "project",
-                "summary": "50 villages implement community-scale biogas plants for cooking and electricity",
-                "source": "Bioenergy International",
-                "date": "2023-04-10"
-            },
-            {
-                "title": "NextEra Energy Expands Renewable Portfolio",
-                "category": "company",
-                "summary": "Company announces 2.8 GW of new solar and wind projects",
-                "source": "Clean Energy Wire",
-                "date": "2023-07-05"
-            },
-            {
-                "title": "Geothermal Energy Potential in East Africa",
-                "category": "location",
-                "summary": "Study identifies 10 GW of untapped geothermal potential in East African Rift",
-                "source": "Geothermal Resources Council",
-                "date": "2023-03-18"
-            },
-            {
-                "title": "Hydrogen Production from Renewable Sources",
-                "category": "technology",
-                "summary": "Advances in electrolysis technology reduce green hydrogen production costs",
-                "source": "International Journal of Hydrogen Energy",
-                "date": "2023-02-28"
-            },
-            {
-                "title": "Battery Storage Integration with Renewable Energy",
-                "category": "technology",
-                "summary": "New battery management systems optimize renewable energy storage",
-                "source": "Energy Storage News",
-                "date": "2023-08-12"
-            }
+        # Base value depends on energy type
+        energy_key = energy_type.lower()
+        base_value, variance = _ENERGY_PROFILES.get(energy_key, _DEFAULT_ENERGY_PROFILE)
+        
+        # Generate the whole time series in one batch: timestamps are an integer
+        # microsecond offset range formatted by NumPy rather than a datetime loop
+        steps = int((end_date - start_date) / interval) + 1
+        offsets = np.arange(steps) * np.timedelta64(interval // timedelta(microseconds=1), "us")
+        timestamps = np.datetime_as_string(np.datetime64(start_date, "us") + offsets, unit="us").tolist()
+        values = np.clip(base_value + self._rng.uniform(-variance, variance, steps), 0, None).round(2).tolist()
+        time_series = [
+            {"timestamp": timestamp, "value": value}
+            for timestamp, value in zip(timestamps, values)
         ]
         
-        # Filter by category if specified
-        if filter_by:
-            results = [r for r in all_results if r["category"].lower() == filter_by.lower()]
-        else:
-            results = all_results
-        
-        # Filter by query if specified
-        if query:
-            query_lower = query.lower()
-            filtered_results = []
-            for result in results:
-                if (query_lower in result["title"].lower() or 
-                    query_lower in result["summary"].lower() or 
-                    query_lower in result["category"].lower()):
-                    filtered_results.append(result)
-            results = filtered_results
-        
-        # Limit results
-        return results[:max_results]
+        # Create data structure based on energy type
+        shape_builder = _ENERGY_SHAPES.get(energy_key, _default_shape)
+        return {"generation": time_series, **shape_builder(self._rng)}
+
+# Tool name -> handler method, so dispatch is a single dict lookup
+_TOOL_HANDLERS = {
+    "fetch_renewable_data": RenewableEnergyMCPServer.handle_fetch_renewable_data,
+    "create_dashboard": RenewableEnergyMCPServer.handle_create_dashboard,
+    "calculate_roi": RenewableEnergyMCPServer.handle_calculate_roi,
+    "get_policy_information": RenewableEnergyMCPServer.handle_get_policy_information,
+    "search_renewable_database": RenewableEnergyMCPServer.handle_search_renewable_database
+}
 
 class MCPRequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the MCP server"""
     
+    # Keep connections alive so clients can reuse them across tool calls
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, the body waits
+    # for the client's delayed ACK (~40ms) on every keep-alive response
+    disable_nagle_algorithm = True
+    
     def __init__(self, *args, **kwargs):
         self.server_instance = RenewableEnergyMCPServer()
         super().__init__(*args, **kwargs)
     
-    def _set_headers(self, content_type="application/json"):
-        self.send_response(200)
+    def log_message(self, format, *args):
+        # Send access logs through the queued logging handler instead of
+        # writing to stderr from the request thread
+        logging.info("%s - %s", self.address_string(), format % args)
+    
+    def _set_headers(self, content_type="application/json", content_length=0, status=200, headers=None):
+        self.send_response(status)
         self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(content_length))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, If-None-Match")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
     
+    def _send_json(self, payload, headers=None):
+        # Handlers may return a body that is already serialized
+        body = payload if isinstance(payload, bytes) else _json_dumps(payload)
+        self._set_headers(content_length=len(body), headers=headers)
+        self.wfile.write(body)
+    
+    def _etag_matches(self, etag):
+        """Check the request's If-None-Match header against an ETag"""
+        if_none_match = self.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        # Clients almost always echo back the single tag they were given
+        if if_none_match == etag or if_none_match == "*":
+            return True
+        if "," not in if_none_match:
+            return if_none_match.strip() in (etag, "*")
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    
+    def _send_cacheable_json(self, payload, etag, cache_control):
+        """Send a JSON body with caching headers, or 304 if the client has it"""
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if self._etag_matches(etag):
+            self._set_headers(status=304, headers=headers)
+        else:
+            self._send_json(payload, headers=headers)
+    
     def do_OPTIONS(self):
         self._set_headers()
     
     def do_GET(self):
         if self.path == "/health":
-            self._set_headers()
-            self.wfile.write(json.dumps({"status": "healthy"}).encode())
+            self._send_json({"status": "healthy"})
         elif self.path == "/tools":
-            self._set_headers()
-            self.wfile.write(json.dumps({"tools": TOOLS}).encode())
+            self._send_cacheable_json(_TOOLS_BODY, _TOOLS_ETAG, "public, max-age=3600")
         else:
-            self._set_headers()
-            self.wfile.write(json.dumps({"error": "Not found"}).encode())
+            self._send_json({"error": "Not found"})
+    
+    def _send_rejection(self, status, message, headers=None):
+        """Send an error without reading the request body, then drop the connection"""
+        # The unread body would otherwise be parsed as the next request
+        self.close_connection = True
+        body = _json_dumps({"error": message})
+        self._set_headers(content_length=len(body), status=status, headers={"Connection": "close", **(headers or {})})
+        self.wfile.write(body)
+    
+    def _read_body(self, content_length):
+        """Read the request body straight into one preallocated buffer"""
+        body = bytearray(content_length)
+        received = self.rfile.readinto(body) or 0
+        if received < content_length:
+            del body[received:]
+        return body
     
     def do_POST(self):
-        content_length = int(self.headers["Content-Length"])
-        post_data = self.rfile.read(content_length)
+        # Check the declared size before allocating or parsing anything
+        try:
+            content_length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_rejection(400, "Invalid Content-Length")
+            return
+        if content_length < 0:
+            self._send_rejection(400, "Invalid Content-Length")
+            return
+        if content_length > MAX_BODY_BYTES:
+            self._send_rejection(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+            return
+        
+        # Shed load instead of queueing once too many requests are in flight
+        if not _in_flight_requests.acquire(blocking=False):
+            self._send_rejection(503, "Server busy", {"Retry-After": "1"})
+            return
+        try:
+            self._handle_post(content_length)
+        finally:
+            _in_flight_requests.release()
+    
+    def _handle_post(self, content_length):
+        post_data = self._read_body(content_length)
         
         try:
-            data = json.loads(post_data.decode())
+            data = _json_loads(post_data)
             
             if self.path == "/api/tool":
                 tool_name = data.get("tool")
                 parameters = data.get("parameters", {})
                 
-                if tool_name == "fetch_renewable_data":
-                    result = self.server_instance.handle_fetch_renewable_data(parameters)
-                elif tool_name == "create_dashboard":
-                    result = self.server_instance.handle_create_dashboard(parameters)
-                elif tool_name == "calculate_roi":
-                    result = self.server_instance.handle_calculate_roi(parameters)
-                elif tool_name == "get_policy_information":
-                    result = self.server_instance.handle_get_policy_information(parameters)
-                elif tool_name == "search_renewable_database":
-                    result = self.server_instance.handle_search_renewable_database(parameters)
+                cache_headers = None
+                if tool_name in _CACHEABLE_TOOLS:
+                    cache_headers = {"ETag": _tool_etag(tool_name, parameters), "Cache-Control": "no-cache"}
+                    # Answer revalidations without re-running the tool
+                    if self._etag_matches(cache_headers["ETag"]):
+                        self._set_headers(status=304, headers=cache_headers)
+                        return
+                
+                if tool_name == "calculate_roi" and isinstance(parameters, list):
+                    handler = RenewableEnergyMCPServer.handle_calculate_roi_batch
+                else:
+                    handler = _TOOL_HANDLERS.get(tool_name)
+                
+                if handler is not None:
+                    result = handler(self.server_instance, parameters)
                 else:
                     result = {"error": f"Unknown tool: {tool_name}"}
                 
-                self._set_headers()
-                self.wfile.write(json.dumps(result).encode())
+                self._send_json(result, headers=cache_headers)
             else:
-                self._set_headers()
-                self.wfile.write(json.dumps({"error": "Not found"}).encode())
+                self._send_json({"error": "Not found"})
         
         except json.JSONDecodeError:
-            self._set_headers()
-            self.wfile.write(json.dumps({"error": "Invalid JSON"}).encode())
+            self._send_json({"error": "Invalid JSON"})
         except Exception as e:
-            self._set_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode())
+            self._send_json({"error": str(e)})
+
+class MCPHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog deep enough for bursts across workers"""
+    request_queue_size = 128
+
+def _reset_worker_state(index, workers, base):
+    """Reset per-process state in a freshly forked worker"""
+    global _dashboard_counter, _log_queue, _log_listener
+    
+    # Interleave dashboard IDs from the parent's shared base so workers never
+    # hand out the same one
+    _dashboard_counter = itertools.count(base + index, workers)
+    
+    # The parent's listener thread doesn't exist in the child; give the
+    # worker its own queue and listener
+    _log_queue = queue.Queue(maxsize=10000)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _DroppingQueueHandler):
+            handler.queue = _log_queue
+    _log_listener = QueueListener(_log_queue, *_log_listener.handlers)
+    _log_listener.start()
 
-def run_server(port=5002):
-    """Run the HTTP server"""
+def run_server(port=5002, workers=None):
+    """
+    Run the HTTP server. With more than one worker, the listening socket is
+    bound once and worker processes are forked to accept on it, so requests
+    are spread over several CPUs (POSIX only; otherwise a single process).
+    """
+    workers = workers or MCP_WORKERS
     server_address = ("", port)
-    httpd = HTTPServer(server_address, MCPRequestHandler)
-    logging.info(f"Starting MCP server on port {port}")
-    httpd.serve_forever()
+    httpd = MCPHTTPServer(server_address, MCPRequestHandler)
+    
+    if workers <= 1 or not hasattr(os, "fork"):
+        logging.info(f"Starting MCP server on port {port}")
+        httpd.serve_forever()
+        return
+    
+    logging.info(f"Starting MCP server on port {port} with {workers} workers")
+    # Taken once here: a per-child clock read could cross a second boundary
+    # between forks and make the workers' ID sequences overlap
+    id_base = int(time.time())
+    children = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            _reset_worker_state(index, workers, id_base)
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                _log_listener.stop()
+                os._exit(0)
+        children.append(pid)
+    
+    # Turn SIGTERM into a normal exit so the workers are stopped with us
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        httpd.server_close()
 
 if __name__ == "__main__":
     try:
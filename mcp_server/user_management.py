@@ -1,18 +1,41 @@
 import hashlib
+import heapq
+import hmac
+import itertools
 import jwt
 import datetime
 import os
-from typing import Dict, Any, Optional, List
+import pickle
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, Optional, List
 import logging
 import uuid
+import zlib
 
-def simple_hash(password: str) -> str:
-    """Simple password hashing using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+# Verified tokens are remembered for at most this many seconds (never past
+# their own expiry), and the cache keeps at most this many entries
+TOKEN_CACHE_TTL = 30
+TOKEN_CACHE_MAXSIZE = 10000
 
-def check_password(hashed_password: str, password: str) -> bool:
-    """Check if password matches the hash"""
-    return hashed_password == simple_hash(password)
+# zlib level for stored dashboard layouts; level 1 gets most of the size
+# reduction at a fraction of the CPU cost of higher levels
+LAYOUT_COMPRESSION_LEVEL = 1
+
+# Dashboard fields a listing needs; pass as `fields` to skip expanding layouts
+DASHBOARD_LISTING_FIELDS = (
+    'title', 'description', 'type', 'created_at', 'is_public', 'public_url'
+)
+
+def simple_hash(password: str) -> bytes:
+    """Simple password hashing using SHA-256 (raw 32-byte digest)"""
+    return hashlib.sha256(password.encode()).digest()
+
+def check_password(hashed_password: bytes, password: str) -> bool:
+    """Check if password matches the hash (constant-time comparison)"""
+    return hmac.compare_digest(hashed_password, simple_hash(password))
 
 class UserManager:
     def __init__(self):
@@ -21,6 +44,25 @@ class UserManager:
         self.users = {}
         self.chat_history = {}
         self.dashboards = {}
+        # email / username -> user_id, so login and registration skip the user scan
+        self._email_index = {}
+        self._username_index = {}
+        # dashboard_id -> owning user_id, so lookups by id skip the per-user scan
+        self._dashboard_owners = {}
+        # dashboard_id -> compressed layout, kept out of the stored record
+        # and only expanded when a dashboard is read
+        self._layouts = {}
+        # Public dashboards only: dashboard_id -> stored record, and
+        # public_url -> dashboard_id, so public lookups skip the full scan
+        self._public_dashboards = {}
+        self._public_url_index = {}
+        
+        # Read once rather than on every token issued or verified
+        self._jwt_secret = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
+        
+        # LRU cache of verified tokens: sha256(token) prefix -> (user_id, valid_until)
+        self._token_cache = OrderedDict()
+        self._token_cache_lock = threading.Lock()
         
         # Create a default admin user
         default_user_id = str(uuid.uuid4())
@@ -37,6 +79,8 @@ class UserManager:
                 'refresh_interval': 300
             }
         }
+        self._email_index['admin@example.com'] = default_user_id
+        self._username_index['admin'] = default_user_id
         
         logging.info("UserManager initialized with in-memory storage")
     
@@ -44,9 +88,8 @@ class UserManager:
         """Register a new user"""
         try:
             # Check if user already exists
-            for user in self.users.values():
-                if user['email'] == email or user['username'] == username:
-                    raise ValueError('Username or email already exists')
+            if email in self._email_index or username in self._username_index:
+                raise ValueError('Username or email already exists')
             
             # Create user document
             user_id = str(uuid.uuid4())
@@ -65,6 +108,8 @@ class UserManager:
             }
             
             self.users[user_id] = user
+            self._email_index[email] = user_id
+            self._username_index[username] = user_id
             
             return self.generate_auth_token(user)
             
@@ -75,11 +120,8 @@ class UserManager:
     def login_user(self, email: str, password: str) -> Dict[str, Any]:
         """Login a user"""
         try:
-            user = None
-            for u in self.users.values():
-                if u['email'] == email:
-                    user = u
-                    break
+            user_id = self._email_index.get(email)
+            user = self.users.get(user_id) if user_id is not None else None
                     
             if not user or not check_password(user['password'], password):
                 raise ValueError('Invalid email or password')
@@ -101,7 +143,7 @@ class UserManager:
                 'username': user['username'],
                 'exp': datetime.datetime.now() + datetime.timedelta(days=7)
             },
-            os.getenv('JWT_SECRET_KEY', 'your-secret-key'),
+            self._jwt_secret,
             algorithm='HS256'
         )
         
@@ -117,14 +159,21 @@ class UserManager:
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify JWT token and return user info"""
+        cache_key = self._token_cache_key(token)
+        
+        user_id = self._get_cached_token(cache_key)
+        if user_id is not None:
+            return self.users.get(user_id)
+        
         try:
             payload = jwt.decode(
                 token,
-                os.getenv('JWT_SECRET_KEY', 'your-secret-key'),
+                self._jwt_secret,
                 algorithms=['HS256']
             )
             
             user_id = payload['user_id']
+            self._cache_token(cache_key, user_id, payload.get('exp'))
             return self.users.get(user_id)
             
         except jwt.ExpiredSignatureError:
@@ -132,6 +181,42 @@ class UserManager:
         except jwt.InvalidTokenError:
             raise ValueError('Invalid token')
     
+    def invalidate_token(self, token: str) -> None:
+        """Forget a cached verification, e.g. on logout, so the token is fully checked next time"""
+        with self._token_cache_lock:
+            self._token_cache.pop(self._token_cache_key(token), None)
+    
+    @staticmethod
+    def _token_cache_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()[:16]
+    
+    def _get_cached_token(self, cache_key: bytes) -> Optional[str]:
+        """Return the user ID for a recently verified token, if still fresh"""
+        with self._token_cache_lock:
+            entry = self._token_cache.get(cache_key)
+            if entry is None:
+                return None
+            
+            user_id, valid_until = entry
+            if time.time() >= valid_until:
+                del self._token_cache[cache_key]
+                return None
+            
+            self._token_cache.move_to_end(cache_key)
+            return user_id
+    
+    def _cache_token(self, cache_key: bytes, user_id: str, exp: Optional[float]) -> None:
+        """Remember a verified token until the TTL or its own expiry, whichever is first"""
+        valid_until = time.time() + TOKEN_CACHE_TTL
+        if exp is not None:
+            valid_until = min(valid_until, exp)
+        
+        with self._token_cache_lock:
+            self._token_cache[cache_key] = (user_id, valid_until)
+            self._token_cache.move_to_end(cache_key)
+            if len(self._token_cache) > TOKEN_CACHE_MAXSIZE:
+                self._token_cache.popitem(last=False)
+    
     def save_chat_history(self, user_id: str, messages: List[Dict[str, Any]]) -> str:
         """Save chat history for a user"""
         try:
@@ -157,22 +242,17 @@ class UserManager:
     def get_chat_history(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get chat history for a user"""
         try:
-            if user_id not in self.chat_history:
-                return []
-                
-            # Sort by timestamp and limit
-            history = sorted(
-                self.chat_history[user_id],
-                key=lambda x: x['timestamp'],
-                reverse=True
-            )
-            
-            return history[:limit]
+            return list(self.iter_chat_history(user_id, limit))
             
         except Exception as e:
             logging.error(f"Error getting chat history: {str(e)}")
             raise
     
+    def iter_chat_history(self, user_id: str, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """Yield a user's chat sessions newest first, up to limit, without copying or sorting the history"""
+        # Sessions are appended as they are saved, so the list is already in timestamp order
+        return itertools.islice(reversed(self.chat_history.get(user_id, [])), limit)
+    
     def save_dashboard(self, user_id: str, dashboard: Dict[str, Any]) -> str:
         """Save dashboard for a user"""
         try:
@@ -189,29 +269,72 @@ class UserManager:
             
             if dashboard['is_public']:
                 # Generate a public URL token
-                public_token = str(uuid.uuid4())
+                public_token = secrets.token_urlsafe(16)
                 dashboard['public_url'] = f"/public/dashboards/{public_token}"
             
-            self.dashboards[user_id][dashboard_id] = dashboard
+            record = self._store_layout(dashboard_id, dashboard)
+            self.dashboards[user_id][dashboard_id] = record
+            self._dashboard_owners[dashboard_id] = user_id
+            if record['is_public']:
+                self._index_public(record)
             return dashboard_id
             
         except Exception as e:
             logging.error(f"Error saving dashboard: {str(e)}")
             raise
     
-    def get_user_dashboards(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get all dashboards for a user"""
+    def _index_public(self, dashboard: Dict[str, Any]) -> None:
+        self._public_dashboards[dashboard['_id']] = dashboard
+        self._public_url_index[dashboard['public_url']] = dashboard['_id']
+    
+    def _unindex_public(self, dashboard: Dict[str, Any]) -> None:
+        self._public_dashboards.pop(dashboard['_id'], None)
+        self._public_url_index.pop(dashboard.get('public_url'), None)
+    
+    def _store_layout(self, dashboard_id: str, dashboard: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress a dashboard's layout into self._layouts and return the record to store without it"""
+        record = {key: value for key, value in dashboard.items() if key != 'layout'}
+        layout = dashboard.get('layout')
+        if layout is not None:
+            self._layouts[dashboard_id] = zlib.compress(
+                pickle.dumps(layout, pickle.HIGHEST_PROTOCOL), LAYOUT_COMPRESSION_LEVEL
+            )
+        return record
+    
+    def _with_layout(self, dashboard: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Copy of a stored dashboard record with its layout expanded"""
+        if dashboard is None:
+            return None
+        result = dict(dashboard)
+        compressed = self._layouts.get(dashboard['_id'])
+        if compressed is not None:
+            result['layout'] = pickle.loads(zlib.decompress(compressed))
+        return result
+    
+    def _project(self, dashboard: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        """The whole dashboard, or only `fields` (plus _id); the layout is expanded only if asked for"""
+        if fields is None:
+            return self._with_layout(dashboard)
+        result = {key: dashboard[key] for key in fields if key in dashboard}
+        result['_id'] = dashboard['_id']
+        if 'layout' in fields:
+            compressed = self._layouts.get(dashboard['_id'])
+            if compressed is not None:
+                result['layout'] = pickle.loads(zlib.decompress(compressed))
+        return result
+    
+    def get_user_dashboards(self, user_id: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all dashboards for a user (only `fields`, e.g. DASHBOARD_LISTING_FIELDS, if given)"""
         try:
             if user_id not in self.dashboards:
                 return []
                 
             # Sort by created_at
             dashboards = list(self.dashboards[user_id].values())
-            return sorted(
-                dashboards,
-                key=lambda x: x['created_at'],
-                reverse=True
-            )
+            return [
+                self._project(dashboard, fields)
+                for dashboard in sorted(dashboards, key=lambda x: x['created_at'], reverse=True)
+            ]
             
         except Exception as e:
             logging.error(f"Error getting user dashboards: {str(e)}")
@@ -220,10 +343,10 @@ class UserManager:
     def get_dashboard(self, dashboard_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific dashboard"""
         try:
-            for user_dashboards in self.dashboards.values():
-                if dashboard_id in user_dashboards:
-                    return user_dashboards[dashboard_id]
-            return None
+            user_id = self._dashboard_owners.get(dashboard_id)
+            if user_id is None:
+                return None
+            return self._with_layout(self.dashboards[user_id].get(dashboard_id))
             
         except Exception as e:
             logging.error(f"Error getting dashboard: {str(e)}")
@@ -235,7 +358,9 @@ class UserManager:
             if user_id not in self.dashboards or dashboard_id not in self.dashboards[user_id]:
                 return False
                 
-            del self.dashboards[user_id][dashboard_id]
+            self._unindex_public(self.dashboards[user_id].pop(dashboard_id))
+            self._dashboard_owners.pop(dashboard_id, None)
+            self._layouts.pop(dashboard_id, None)
             return True
             
         except Exception as e:
@@ -258,14 +383,10 @@ class UserManager:
     def get_public_dashboard(self, public_token: str) -> Optional[Dict[str, Any]]:
         """Get a public dashboard by its token"""
         try:
-            public_url = f"/public/dashboards/{public_token}"
-            
-            for user_dashboards in self.dashboards.values():
-                for dashboard in user_dashboards.values():
-                    if dashboard.get('public_url') == public_url and dashboard.get('is_public'):
-                        return dashboard
-            
-            return None
+            dashboard_id = self._public_url_index.get(f"/public/dashboards/{public_token}")
+            if dashboard_id is None:
+                return None
+            return self._with_layout(self._public_dashboards[dashboard_id])
             
         except Exception as e:
             logging.error(f"Error getting public dashboard: {str(e)}")
@@ -280,38 +401,34 @@ class UserManager:
             dashboard = self.dashboards[user_id][dashboard_id]
             dashboard['is_public'] = is_public
             
-            if is_public and not dashboard.get('public_url'):
-                # Generate public URL if making public
-                public_token = str(uuid.uuid4())
-                dashboard['public_url'] = f"/public/dashboards/{public_token}"
-            elif not is_public:
+            if is_public:
+                if not dashboard.get('public_url'):
+                    # Generate public URL if making public
+                    public_token = secrets.token_urlsafe(16)
+                    dashboard['public_url'] = f"/public/dashboards/{public_token}"
+                self._index_public(dashboard)
+            else:
                 # Remove public URL if making private
+                self._unindex_public(dashboard)
                 dashboard['public_url'] = None
             
-            return dashboard
+            return self._with_layout(dashboard)
             
         except Exception as e:
             logging.error(f"Error setting dashboard visibility: {str(e)}")
             raise
     
-    def get_public_dashboards(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get all public dashboards"""
+    def get_public_dashboards(self, limit: int = 50, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all public dashboards (only `fields`, e.g. DASHBOARD_LISTING_FIELDS, if given)"""
         try:
-            public_dashboards = []
-            
-            for user_dashboards in self.dashboards.values():
-                for dashboard in user_dashboards.values():
-                    if dashboard.get('is_public'):
-                        public_dashboards.append(dashboard)
-            
-            # Sort by created_at
-            public_dashboards = sorted(
-                public_dashboards,
-                key=lambda x: x['created_at'],
-                reverse=True
+            # Newest first; only the top `limit` are ordered
+            public_dashboards = heapq.nlargest(
+                limit,
+                self._public_dashboards.values(),
+                key=lambda x: x['created_at']
             )
             
-            return public_dashboards[:limit]
+            return [self._project(dashboard, fields) for dashboard in public_dashboards]
             
         except Exception as e:
             logging.error(f"Error getting public dashboards: {str(e)}")
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class TTLCache:
+    """Thread-safe TTL + LRU cache"""
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+def _content_default(obj):
+    """
+    Encode values the JSON encoders don't handle natively. Frames and series
+    are encoded by their full content, since their str() is a truncated preview.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        frame = obj.to_frame() if isinstance(obj, pd.Series) else obj
+        content = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+        return {
+            "columns": [str(col) for col in frame.columns],
+            "dtypes": [str(dtype) for dtype in frame.dtypes],
+            "content": hashlib.blake2b(content.tobytes(), digest_size=16).hexdigest()
+        }
+    return obj.tolist() if hasattr(obj, "tolist") else str(obj)
+
+def content_digest(data, *parts):
+    """
+    Cache key for data plus extra string parts: a blake2b digest of the data's
+    sorted-key JSON and the parts.
+    
+    Args:
+        data: The data to key by content
+        *parts (str): Further inputs the cached value depends on
+    
+    Returns:
+        bytes: The digest, or None if the data can't be serialized
+    """
+    try:
+        if orjson is not None:
+            encoded = orjson.dumps(
+                data,
+                default=_content_default,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        else:
+            encoded = json.dumps(data, sort_keys=True, default=_content_default).encode()
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(b"\0".join((encoded, *(part.encode() for part in parts))), digest_size=16).digest()
@@ -5,9 +5,77 @@ import logging
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import hashlib
 from datetime import datetime
 import uuid
 
+# Column names treated as the time axis when choosing a visualization
+TIME_COLUMN_NAMES = frozenset(["date", "time", "year", "month", "day"])
+# Value types accepted as whole columns in columnar data
+COLUMN_TYPES = (list, tuple, np.ndarray, pd.Series)
+# select_dtypes selectors for classify_columns; timedelta is excluded from
+# numeric separately, since pandas counts it as a number
+NUMERIC_SELECTORS = [np.number, "bool", "boolean"]
+CATEGORICAL_SELECTORS = ["object", "category", "string"]
+DATETIME_SELECTORS = ["datetime", "datetimetz"]
+
+def classify_columns(df, include_bool=True):
+    """
+    Split a DataFrame's columns by dtype, selecting on the frame's blocks
+    rather than testing each column's dtype in Python.
+    
+    Args:
+        df (pandas.DataFrame): The data
+        include_bool (bool, optional): Count boolean columns as numeric. Defaults to True.
+        
+    Returns:
+        tuple: (numeric, categorical, datetime) lists of column names
+    """
+    numeric_selectors = NUMERIC_SELECTORS if include_bool else [np.number]
+    numeric_cols = df.select_dtypes(include=numeric_selectors, exclude="timedelta").columns.tolist()
+    categorical_cols = df.select_dtypes(include=CATEGORICAL_SELECTORS).columns.tolist()
+    datetime_cols = df.select_dtypes(include=DATETIME_SELECTORS).columns.tolist()
+    return numeric_cols, categorical_cols, datetime_cols
+
+def column_arrays(df, **roles):
+    """
+    Build plotly express arguments from DataFrame columns as numpy arrays.
+    
+    Plotly express rebuilds its own frame from a DataFrame argument; plain
+    arrays skip that, and the labels keep the column names on axes and hovers.
+    
+    Args:
+        df (pandas.DataFrame): The data
+        **roles: Plotly express argument name to column name, e.g. x="region"
+        
+    Returns:
+        dict: Keyword arguments for a px.* call
+    """
+    arrays = {role: df[col].to_numpy() for role, col in roles.items()}
+    # Plotly builds hover text by concatenating labels, so they must be strings
+    return {**arrays, "labels": {role: str(col) for role, col in roles.items()}}
+
+def save_figure(fig):
+    """
+    Write a figure under data/visualizations, named by a digest of its JSON
+    so identical charts share one file instead of being written again.
+    
+    Args:
+        fig (plotly.graph_objects.Figure): The figure to save
+        
+    Returns:
+        str: The URL of the visualization
+    """
+    viz_id = hashlib.blake2b(fig.to_json().encode(), digest_size=16).hexdigest()
+    filename = f"data/visualizations/{viz_id}.html"
+    if not os.path.exists(filename):
+        # Write aside and rename, so a concurrent reader never sees a partial file;
+        # the fixed div id keeps the file identical whoever writes it
+        tmp_filename = f"{filename}.{uuid.uuid4().hex}.tmp"
+        fig.write_html(tmp_filename, include_plotlyjs="cdn", div_id=viz_id)
+        os.replace(tmp_filename, filename)
+    return f"/visualizations/{viz_id}.html"
+
 class DataProcessor:
     def __init__(self):
         """
@@ -19,12 +87,13 @@ class DataProcessor:
         
         logging.info("Data processor initialized")
     
-    def process(self, data):
+    def process(self, data, processed_at=None):
         """
         Process the data.
         
         Args:
             data (dict): The data to process
+            processed_at (str, optional): ISO timestamp for the metadata. Defaults to now.
             
         Returns:
             dict: The processed data
@@ -39,7 +108,7 @@ class DataProcessor:
             
             # Add metadata
             processed_data["metadata"] = {
-                "processed_at": datetime.now().isoformat(),
+                "processed_at": processed_at or datetime.now().isoformat(),
                 "processor_version": "1.0.0"
             }
             
@@ -49,6 +118,19 @@ class DataProcessor:
             logging.error(f"Error processing data: {str(e)}")
             raise Exception(f"Failed to process data: {str(e)}")
     
+    def process_many(self, items):
+        """
+        Process several payloads, stamping them all with one timestamp.
+        
+        Args:
+            items (iterable): The data payloads to process
+            
+        Returns:
+            list: The processed payloads, in order
+        """
+        processed_at = datetime.now().isoformat()
+        return [self.process(item, processed_at) for item in items]
+    
     def convert_to_dataframe(self, data):
         """
         Convert the data to a pandas DataFrame.
@@ -66,23 +148,27 @@ class DataProcessor:
             else:
                 data_to_convert = data
             
-            # Check if the data is a list of dictionaries
-            if isinstance(data_to_convert, list) and all(isinstance(item, dict) for item in data_to_convert):
-                return pd.DataFrame(data_to_convert)
+            # Already a DataFrame
+            if isinstance(data_to_convert, pd.DataFrame):
+                return data_to_convert
             
-            # Check if the data is a dictionary of lists
-            elif isinstance(data_to_convert, dict) and all(isinstance(item, list) for item in data_to_convert.values()):
+            # Check if the data is a list of dictionaries; only the first row is
+            # checked, pandas raises on any later row that isn't a dictionary
+            elif isinstance(data_to_convert, list) and (not data_to_convert or isinstance(data_to_convert[0], dict)):
                 return pd.DataFrame(data_to_convert)
             
-            # Check if the data is a dictionary of dictionaries
-            elif isinstance(data_to_convert, dict) and all(isinstance(item, dict) for item in data_to_convert.values()):
-                # Convert to a list of dictionaries
-                data_list = []
-                for key, value in data_to_convert.items():
-                    value["id"] = key
-                    data_list.append(value)
-                
-                return pd.DataFrame(data_list)
+            # Check if the data is columnar: a dictionary of lists or arrays,
+            # which pandas takes over without copying
+            elif isinstance(data_to_convert, dict) and all(isinstance(item, COLUMN_TYPES) for item in data_to_convert.values()):
+                return pd.DataFrame(data_to_convert, copy=False)
+            
+            # Check if the data is a dictionary of dictionaries, again from the first row
+            elif isinstance(data_to_convert, dict) and isinstance(next(iter(data_to_convert.values())), dict):
+                # One row per inner dictionary, with the outer keys as an id
+                # column, leaving the caller's dictionaries untouched
+                df = pd.DataFrame(list(data_to_convert.values()))
+                df["id"] = list(data_to_convert.keys())
+                return df
             
             else:
                 raise ValueError("Data format not supported for conversion to DataFrame")
@@ -106,26 +192,25 @@ class DataProcessor:
             # Convert the data to a DataFrame
             df = self.convert_to_dataframe(data)
             
-            # Generate a unique ID for the visualization
-            viz_id = str(uuid.uuid4())
+            # Classify columns and find the time column once; every branch below reuses them.
+            # Booleans count as categories here, so a line chart's y columns share one kind
+            numeric_cols = classify_columns(df, include_bool=False)[0]
+            numeric_set = set(numeric_cols)
+            categorical_cols = [col for col in df.columns if col not in numeric_set]
+            time_col = next((col for col in df.columns if isinstance(col, str) and col.lower() in TIME_COLUMN_NAMES), None)
             
             # Determine the visualization type if set to auto
             if visualization_type == "auto":
                 # Check the number of columns
                 if len(df.columns) == 2:
                     # Check if one column is numeric and the other is categorical
-                    if df.dtypes.iloc[0] in ["int64", "float64"] and df.dtypes.iloc[1] not in ["int64", "float64"]:
-                        visualization_type = "bar"
-                    elif df.dtypes.iloc[1] in ["int64", "float64"] and df.dtypes.iloc[0] not in ["int64", "float64"]:
+                    if len(numeric_cols) == 1:
                         visualization_type = "bar"
                     else:
                         visualization_type = "scatter"
                 
                 # Check if there's a time column
-                elif any(col.lower() in ["date", "time", "year", "month", "day"] for col in df.columns):
-                    time_col = next(col for col in df.columns if col.lower() in ["date", "time", "year", "month", "day"])
-                    numeric_cols = [col for col in df.columns if df[col].dtype in ["int64", "float64"]]
-                    
+                elif time_col is not None:
                     if numeric_cols:
                         visualization_type = "line"
                     else:
@@ -139,57 +224,35 @@ class DataProcessor:
             fig = None
             
             if visualization_type == "bar":
-                # Identify categorical and numeric columns
-                categorical_cols = [col for col in df.columns if df[col].dtype not in ["int64", "float64"]]
-                numeric_cols = [col for col in df.columns if df[col].dtype in ["int64", "float64"]]
-                
                 if categorical_cols and numeric_cols:
-                    fig = px.bar(df, x=categorical_cols[0], y=numeric_cols[0], title="Renewable Energy Data")
+                    fig = px.bar(**column_arrays(df, x=categorical_cols[0], y=numeric_cols[0]), title="Renewable Energy Data")
             
             elif visualization_type == "line":
-                # Identify time and numeric columns
-                time_col = next((col for col in df.columns if col.lower() in ["date", "time", "year", "month", "day"]), None)
-                numeric_cols = [col for col in df.columns if df[col].dtype in ["int64", "float64"]]
-                
                 if time_col and numeric_cols:
                     fig = px.line(df, x=time_col, y=numeric_cols, title="Renewable Energy Trends")
             
             elif visualization_type == "scatter":
-                # Identify numeric columns
-                numeric_cols = [col for col in df.columns if df[col].dtype in ["int64", "float64"]]
-                
                 if len(numeric_cols) >= 2:
-                    fig = px.scatter(df, x=numeric_cols[0], y=numeric_cols[1], title="Renewable Energy Correlation")
+                    fig = px.scatter(**column_arrays(df, x=numeric_cols[0], y=numeric_cols[1]), title="Renewable Energy Correlation")
             
             elif visualization_type == "pie":
-                # Identify categorical and numeric columns
-                categorical_cols = [col for col in df.columns if df[col].dtype not in ["int64", "float64"]]
-                numeric_cols = [col for col in df.columns if df[col].dtype in ["int64", "float64"]]
-                
                 if categorical_cols and numeric_cols:
-                    fig = px.pie(df, names=categorical_cols[0], values=numeric_cols[0], title="Renewable Energy Distribution")
+                    fig = px.pie(**column_arrays(df, names=categorical_cols[0], values=numeric_cols[0]), title="Renewable Energy Distribution")
             
             elif visualization_type == "table":
                 fig = go.Figure(data=[go.Table(
                     header=dict(values=list(df.columns),
                                 fill_color='paleturquoise',
                                 align='left'),
-                    cells=dict(values=[df[col] for col in df.columns],
+                    cells=dict(values=[df[col].to_numpy() for col in df.columns],
                                fill_color='lavender',
                                align='left'))
                 ])
                 fig.update_layout(title="Renewable Energy Data Table")
             
-            # Save the visualization
+            # Save the visualization and return its URL
             if fig:
-                # Create a unique filename
-                filename = f"data/visualizations/{viz_id}.html"
-                
-                # Save the figure as an HTML file
-                fig.write_html(filename)
-                
-                # Return the URL of the visualization
-                return f"/visualizations/{viz_id}.html"
+                return save_figure(fig)
             else:
                 raise ValueError(f"Failed to generate visualization of type {visualization_type}")
         
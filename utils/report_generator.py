@@ -1,14 +1,198 @@
 import os
+import copy
+import hashlib
 import json
 import logging
+import multiprocessing
+import re
+import threading
 from datetime import datetime
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+import numpy as np
 import pandas as pd
-from jinja2 import Template
+from jinja2 import Environment
 import plotly.express as px
-import plotly.graph_objects as go
 from api.claude_api import ClaudeAPI
 from api.openai_api import OpenAIAPI
+from utils.content_cache import TTLCache, content_digest
+from utils.data_processor import classify_columns, column_arrays, save_figure
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Energy-type keywords recognised in report queries, in match priority order
+ENERGY_TYPE_PATTERNS = [
+    ("Solar Energy", re.compile("solar", re.IGNORECASE)),
+    ("Wind Energy", re.compile("wind", re.IGNORECASE)),
+    ("Biogas Energy", re.compile("biogas|cbg", re.IGNORECASE))
+]
+
+# Concurrent LLM calls for report content, across all report requests
+REPORT_CONTENT_WORKERS = 4
+# Processes used by generate_report_batch; None means one per CPU
+REPORT_BATCH_WORKERS = None
+# Entries kept in each report cache (LLM content per prompt, report URL per
+# request), and for how long (seconds)
+REPORT_CACHE_SIZE = 128
+REPORT_CACHE_TTL = 3600
+# Fixed instructions for report generation, sent as the system prompt ahead
+# of the per-report data and query
+REPORT_SYSTEM_PROMPT = """You are a Renewable Energy Consultant generating a report. Please analyze the data \
+in the user message and create a comprehensive report that addresses the query.
+
+Generate a report with the following sections:
+1. Executive Summary
+2. Introduction
+3. Data Analysis
+4. Key Findings
+5. Recommendations
+6. Conclusion
+
+Format your response as a JSON object with the following structure:
+{
+    "title": "Report title",
+    "sections": [
+        {
+            "title": "Executive Summary",
+            "content": "Content of the executive summary"
+        },
+        ...
+    ]
+}"""
+
+# Upper bound on the data text embedded in a report prompt
+PROMPT_DATA_MAX_CHARS = 8000
+# Categorical columns with more distinct values than this are sampled
+PROMPT_CATEGORY_LIMIT = 20
+
+def _json_default(obj):
+    """Fallback for values the JSON encoders don't handle natively"""
+    return obj.tolist() if hasattr(obj, "tolist") else str(obj)
+
+def _json_bytes(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode()
+
+def _json_dumps(obj) -> str:
+    """Serialize obj to a compact JSON string"""
+    return _json_bytes(obj).decode()
+
+def _json_loads(text):
+    """Parse JSON text, using orjson when it is installed; both raise json.JSONDecodeError"""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+# Locates JSON objects embedded in free-form LLM responses
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json_object(text):
+    """Return the first complete JSON object embedded in text, or None"""
+    start = text.find("{")
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+    return None
+
+def _parse_report_json(text):
+    """Parse an LLM response as JSON, or the first JSON object embedded in it; None if neither works"""
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        return _extract_json_object(text)
+
+# Autoescaping environment for report markup; section content, which is
+# HTML on purpose, opts out with | safe
+_JINJA_ENV = Environment(autoescape=True, auto_reload=False)
+
+# HTML report layout, compiled once at import rather than on every report
+HTML_REPORT_TEMPLATE = _JINJA_ENV.from_string("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ report_content.title }}</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        h1 {
+            color: #2c3e50;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #2980b9;
+            margin-top: 30px;
+        }
+        .visualization {
+            margin: 30px 0;
+            text-align: center;
+        }
+        .visualization iframe {
+            width: 100%;
+            height: 500px;
+            border: none;
+        }
+        .metadata {
+            background-color: #f8f9fa;
+            padding: 15px;
+            border-radius: 5px;
+            margin-top: 40px;
+            font-size: 0.9em;
+        }
+        .executive-summary {
+            background-color: #e8f4f8;
+            padding: 20px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+    </style>
+</head>
+<body>
+    <h1>{{ report_content.title }}</h1>
+    
+    <div class="metadata">
+        <p><strong>Generated:</strong> {{ timestamp }}</p>
+        <p><strong>Query:</strong> {{ query }}</p>
+        <p><strong>Report ID:</strong> {{ report_id }}</p>
+    </div>
+    
+    {% for section in report_content.sections %}
+        <h2>{{ section.title }}</h2>
+        {% if section.title == "Executive Summary" %}
+            <div class="executive-summary">
+                {{ section.content | safe }}
+            </div>
+        {% else %}
+            <div>
+                {{ section.content | safe }}
+            </div>
+        {% endif %}
+        
+        {% if section.title == "Data Analysis" or section.title == "Key Findings" %}
+            {% for viz in visualizations %}
+                <div class="visualization">
+                    <h3>{{ viz.title }}</h3>
+                    <iframe src="{{ viz.url }}"></iframe>
+                </div>
+            {% endfor %}
+        {% endif %}
+    {% endfor %}
+</body>
+</html>
+""")
 
 class ReportGenerator:
     def __init__(self):
@@ -19,6 +203,19 @@ class ReportGenerator:
         os.makedirs("data/reports", exist_ok=True)
         os.makedirs("data/visualizations", exist_ok=True)
         
+        # Runs LLM report-content calls while visualizations are built
+        self._executor = ThreadPoolExecutor(max_workers=REPORT_CONTENT_WORKERS, thread_name_prefix="report-content")
+        
+        # LLM-written report content by prompt digest, and finished report
+        # URLs by request digest
+        self._content_cache = TTLCache(REPORT_CACHE_SIZE, REPORT_CACHE_TTL)
+        self._report_urls = TTLCache(REPORT_CACHE_SIZE, REPORT_CACHE_TTL)
+        
+        # Seconds to wait on Claude before also asking OpenAI for the same
+        # report; unset keeps the plain fallback, which never pays for both
+        hedge_delay = os.getenv("REPORT_LLM_HEDGE_DELAY")
+        self._hedge_delay = float(hedge_delay) if hedge_delay else None
+        
         # Initialize API clients
         self.claude_api = None
         self.openai_api = None
@@ -46,7 +243,25 @@ class ReportGenerator:
         
         logging.info("Report generator initialized")
     
-    def generate_report(self, data, query, format="html"):
+    @classmethod
+    def generate_report_batch(cls, jobs):
+        """
+        Generate many reports in parallel across worker processes.
+        
+        Workers are spawned, and each re-imports the __main__ module, so call
+        this from a light entry point such as a batch script. Called from the
+        process started by `python app.py`, it would re-run app.py's
+        module-level setup once per worker.
+        
+        Args:
+            jobs (list): (data, query, format) tuples, one per report
+            
+        Returns:
+            list: The URL of each report in job order, or None for jobs that failed
+        """
+        return list(_get_batch_pool(cls).map(_run_batch_job, jobs))
+    
+    def generate_report(self, data, query, format="html", force_regenerate=False):
         """
         Generate a report based on the data and query.
         
@@ -54,19 +269,29 @@ class ReportGenerator:
             data (dict): The data to include in the report
             query (str): The user's query that prompted the report
             format (str, optional): The format of the report. Defaults to "html".
+            force_regenerate (bool, optional): Build a new report even if an identical
+                request was answered recently. Defaults to False.
             
         Returns:
             str: The URL of the generated report
         """
         try:
-            # Generate a unique ID for the report
-            report_id = str(uuid.uuid4())
+            # An identical request was answered recently and its file is still there
+            report_key = None if force_regenerate else content_digest(data, query, format.lower())
+            if report_key is not None:
+                report_url = self._report_urls.get(report_key)
+                if report_url is not None and os.path.exists(f"data{report_url}"):
+                    logging.info("Reusing recently generated report")
+                    return report_url
             
-            # Generate the report content using AI
-            report_content = self._generate_report_content(data, query)
+            # Generate a unique ID for the report
+            report_id = uuid.uuid4().hex
             
-            # Generate visualizations for the report
+            # Generate the report content using AI in the background, and the
+            # visualizations for the report meanwhile
+            content_future = self._executor.submit(self._generate_report_content, data, query)
             visualizations = self._generate_report_visualizations(data)
+            report_content, from_llm = content_future.result()
             
             # Create the report based on the format
             if format.lower() == "html":
@@ -78,12 +303,105 @@ class ReportGenerator:
             else:
                 raise ValueError(f"Unsupported report format: {format}")
             
+            # Fallback reports aren't reused, so the next request can reach the LLM
+            if report_key is not None and from_llm:
+                self._report_urls.put(report_key, report_url)
+            
             return report_url
         
         except Exception as e:
             logging.error(f"Error generating report: {str(e)}")
             raise Exception(f"Failed to generate report: {str(e)}")
     
+    def _summarize_for_prompt(self, data, max_chars=PROMPT_DATA_MAX_CHARS):
+        """
+        Condense report data into compact JSON text for an LLM prompt.
+        
+        Tabular data is reduced to per-column statistics: min/max/mean for
+        numeric columns, earliest/latest for datetimes and distinct values
+        (sampled past PROMPT_CATEGORY_LIMIT) for categoricals.
+        
+        Args:
+            data (dict): The data to summarize
+            max_chars (int, optional): Length cap for the returned text
+            
+        Returns:
+            str: The summary
+        """
+        summary = data
+        try:
+            if isinstance(data, dict) and isinstance(data.get("data"), (list, dict, pd.DataFrame)):
+                records, context = data["data"], {k: v for k, v in data.items() if k != "data"}
+            elif isinstance(data, (list, pd.DataFrame)):
+                records, context = data, {}
+            else:
+                records = None
+            
+            if records is not None:
+                df = pd.DataFrame(records)
+                numeric_cols, categorical_cols, datetime_cols = classify_columns(df)
+                columns = {}
+                for col in numeric_cols:
+                    values = df[col]
+                    columns[col] = {"min": values.min(), "max": values.max(), "mean": round(float(values.mean()), 4)}
+                for col in datetime_cols:
+                    columns[col] = {"earliest": df[col].min(), "latest": df[col].max()}
+                for col in categorical_cols:
+                    distinct = df[col].astype(str).unique()
+                    key = "values" if len(distinct) <= PROMPT_CATEGORY_LIMIT else "sample"
+                    columns[col] = {key: distinct[:PROMPT_CATEGORY_LIMIT].tolist()}
+                summary = {**context, "rows": len(df), "columns": columns}
+        except Exception as e:
+            logging.warning(f"Could not summarize report data, sending it as is: {str(e)}")
+        
+        text = _json_dumps(summary)
+        if len(text) > max_chars:
+            text = text[:max_chars] + "...(truncated)"
+        return text
+    
+    def _hedged_completion(self, user_content):
+        """
+        Ask Claude for report content, and OpenAI as well if Claude hasn't
+        answered with JSON within the hedge delay.
+        
+        Args:
+            user_content (str): The per-report prompt message
+            
+        Returns:
+            tuple: The first response that parses as JSON and its parsed content;
+            failing that the first non-empty response and None, or (None, None)
+            if both providers failed
+        """
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-hedge")
+        try:
+            futures = {pool.submit(self.claude_api.complete, REPORT_SYSTEM_PROMPT, user_content): "Claude"}
+            claude = next(iter(futures))
+            wait(futures, timeout=self._hedge_delay)
+            # Claude's answer only makes OpenAI unnecessary if it is usable JSON
+            claude_ok = claude.done() and claude.exception() is None and claude.result()
+            if not (claude_ok and _parse_report_json(claude.result()) is not None):
+                futures[pool.submit(self.openai_api.complete, REPORT_SYSTEM_PROMPT, user_content)] = "OpenAI"
+            
+            fallback = None
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logging.warning(f"Error generating report with {futures[future]}: {str(e)}")
+                    continue
+                if not response:
+                    continue
+                report_content = _parse_report_json(response)
+                if report_content is not None:
+                    return response, report_content
+                # Keep prose in case neither provider returns JSON
+                if fallback is None:
+                    fallback = response
+            return fallback, None
+        finally:
+            # Don't wait for the slower provider; its answer is discarded
+            pool.shutdown(wait=False)
+    
     def _generate_report_content(self, data, query):
         """
         Generate the content for the report using AI.
@@ -93,82 +411,66 @@ class ReportGenerator:
             query (str): The user's query that prompted the report
             
         Returns:
-            dict: The generated report content
+            tuple: The report content, and whether an LLM wrote it (False for
+            the simple fallback report)
         """
         try:
-            # Prepare the prompt for the AI
-            prompt = f"""
-            You are a Renewable Energy Consultant generating a report. Please analyze the following data 
-            and create a comprehensive report that addresses the query.
-            
-            DATA:
-            {json.dumps(data, indent=2)}
-            
-            QUERY:
-            {query}
-            
-            Generate a report with the following sections:
-            1. Executive Summary
-            2. Introduction
-            3. Data Analysis
-            4. Key Findings
-            5. Recommendations
-            6. Conclusion
-            
-            Format your response as a JSON object with the following structure:
-            {{
-                "title": "Report title",
-                "sections": [
-                    {{
-                        "title": "Executive Summary",
-                        "content": "Content of the executive summary"
-                    }},
-                    ...
-                ]
-            }}
-            """
+            # Summarize the data for the prompt
+            data_summary = self._summarize_for_prompt(data)
+            
+            # Only the data and query vary per report; the instructions are the
+            # fixed REPORT_SYSTEM_PROMPT, so the prompt prefix stays cacheable
+            user_content = f"DATA:\n{data_summary}\n\nQUERY:\n{query}"
+            
+            # The same prompt was answered recently; reuse that report
+            cache_key = hashlib.blake2b(user_content.encode(), digest_size=16).digest()
+            cached = self._content_cache.get(cache_key)
+            if cached is not None:
+                logging.info("Reusing cached report content")
+                return copy.deepcopy(cached), True
             
             response = None
+            report_content = None
+            
+            # With both providers configured and hedging on, race OpenAI
+            # against a slow Claude call
+            hedged = self.claude_api and self.openai_api and self._hedge_delay is not None
+            if hedged:
+                response, report_content = self._hedged_completion(user_content)
             
             # Try to generate the report content using Claude if available
-            if self.claude_api:
+            elif self.claude_api:
                 try:
-                    response = self.claude_api.analyze_data(data, prompt)
+                    response = self.claude_api.complete(REPORT_SYSTEM_PROMPT, user_content)
                 except Exception as e:
                     logging.warning(f"Error generating report with Claude: {str(e)}. Falling back to OpenAI.")
             
             # Fall back to OpenAI if Claude is not available or failed
-            if not response and self.openai_api:
+            if not response and self.openai_api and not hedged:
                 try:
-                    response = self.openai_api.analyze_data(data, prompt)
+                    response = self.openai_api.complete(REPORT_SYSTEM_PROMPT, user_content)
                 except Exception as e:
                     logging.warning(f"Error generating report with OpenAI: {str(e)}")
             
             # If both APIs failed or are not available, generate a simple report
             if not response:
                 logging.warning("No LLM APIs available for report generation. Creating a simple report.")
-                return self._generate_simple_report(data, query)
+                return self._generate_simple_report(data, query), False
             
-            # Parse the response as JSON
-            try:
-                report_content = json.loads(response)
-            except json.JSONDecodeError:
-                # If the response is not valid JSON, extract the JSON part
-                json_start = response.find('{')
-                json_end = response.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = response[json_start:json_end]
-                    report_content = json.loads(json_str)
-                else:
-                    # If we can't extract JSON, create a simple structure
-                    report_content = self._generate_simple_report(data, query, response)
+            # Parse the response as JSON, or extract the JSON part of it
+            if report_content is None:
+                report_content = _parse_report_json(response)
+            
+            # If we can't extract JSON, create a simple structure
+            if report_content is None:
+                return self._generate_simple_report(data, query, response), False
             
-            return report_content
+            self._content_cache.put(cache_key, copy.deepcopy(report_content))
+            return report_content, True
         
         except Exception as e:
             logging.error(f"Error generating report content: {str(e)}")
-            return self._generate_simple_report(data, query)
+            return self._generate_simple_report(data, query), False
     
     def _generate_simple_report(self, data, query, content=None):
         """
@@ -186,12 +488,11 @@ class ReportGenerator:
         energy_type = "Renewable Energy"
         if isinstance(data, dict) and "energy_type" in data:
             energy_type = data["energy_type"].capitalize()
-        elif "solar" in query.lower():
-            energy_type = "Solar Energy"
-        elif "wind" in query.lower():
-            energy_type = "Wind Energy"
-        elif "biogas" in query.lower() or "cbg" in query.lower():
-            energy_type = "Biogas Energy"
+        else:
+            for label, pattern in ENERGY_TYPE_PATTERNS:
+                if pattern.search(query):
+                    energy_type = label
+                    break
         
         # Create a simple report structure
         report = {
@@ -214,10 +515,11 @@ class ReportGenerator:
         
         # Add the data summary section
         if isinstance(data, dict):
-            summary = "Key data points:\n"
-            for key, value in data.items():
-                if not isinstance(value, (dict, list)):
-                    summary += f"- {key}: {value}\n"
+            summary = "Key data points:\n" + "".join(
+                f"- {key}: {value}\n"
+                for key, value in data.items()
+                if not isinstance(value, (dict, list))
+            )
             
             report["sections"].append({
                 "title": "Data Summary",
@@ -252,80 +554,65 @@ class ReportGenerator:
         try:
             visualizations = []
             
-            # Convert the data to a DataFrame
-            if isinstance(data, dict) and "data" in data:
-                df = pd.DataFrame(data["data"])
+            # Convert the data to a DataFrame; frames and columnar arrays are
+            # used as they are rather than copied
+            if isinstance(data, pd.DataFrame):
+                df = data
+            elif isinstance(data, dict) and "data" in data:
+                df = pd.DataFrame(data["data"], copy=False)
             elif isinstance(data, list):
                 df = pd.DataFrame(data)
             else:
                 df = pd.DataFrame([data])
             
             # Generate visualizations based on the data types
-            
-            # Check for numeric columns
-            numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
-            
-            # Check for categorical columns
-            categorical_cols = [col for col in df.columns if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_categorical_dtype(df[col])]
-            
-            # Check for datetime columns
-            datetime_cols = [col for col in df.columns if pd.api.types.is_datetime64_dtype(df[col])]
+            numeric_cols, categorical_cols, datetime_cols = classify_columns(df)
             
             # Generate a bar chart if we have categorical and numeric columns
             if categorical_cols and numeric_cols:
-                viz_id = str(uuid.uuid4())
-                filename = f"data/visualizations/{viz_id}.html"
-                
-                fig = px.bar(df, x=categorical_cols[0], y=numeric_cols[0], title=f"{numeric_cols[0]} by {categorical_cols[0]}")
-                fig.write_html(filename)
+                fig = px.bar(**column_arrays(df, x=categorical_cols[0], y=numeric_cols[0]), title=f"{numeric_cols[0]} by {categorical_cols[0]}")
+                url = save_figure(fig)
                 
                 visualizations.append({
                     "title": f"{numeric_cols[0]} by {categorical_cols[0]}",
                     "type": "bar",
-                    "url": f"/visualizations/{viz_id}.html"
+                    "url": url
                 })
             
             # Generate a line chart if we have datetime and numeric columns
             if datetime_cols and numeric_cols:
-                viz_id = str(uuid.uuid4())
-                filename = f"data/visualizations/{viz_id}.html"
-                
                 fig = px.line(df, x=datetime_cols[0], y=numeric_cols, title=f"{', '.join(numeric_cols)} over Time")
-                fig.write_html(filename)
+                url = save_figure(fig)
                 
                 visualizations.append({
                     "title": f"{', '.join(numeric_cols)} over Time",
                     "type": "line",
-                    "url": f"/visualizations/{viz_id}.html"
+                    "url": url
                 })
             
-            # Generate a pie chart for distribution of a categorical column
-            if categorical_cols and len(df[categorical_cols[0]].unique()) <= 10:
-                viz_id = str(uuid.uuid4())
-                filename = f"data/visualizations/{viz_id}.html"
-                
-                value_counts = df[categorical_cols[0]].value_counts()
-                fig = px.pie(names=value_counts.index, values=value_counts.values, title=f"Distribution of {categorical_cols[0]}")
-                fig.write_html(filename)
+            # Generate a pie chart for distribution of a categorical column,
+            # counting categories from a single factorize pass
+            codes, categories = pd.factorize(df[categorical_cols[0]], sort=False) if categorical_cols else (None, ())
+            if categorical_cols and len(categories) <= 10:
+                counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+                fig = px.pie(names=categories, values=counts, title=f"Distribution of {categorical_cols[0]}")
+                url = save_figure(fig)
                 
                 visualizations.append({
                     "title": f"Distribution of {categorical_cols[0]}",
                     "type": "pie",
-                    "url": f"/visualizations/{viz_id}.html"
+                    "url": url
                 })
             
             # Generate a scatter plot if we have at least 2 numeric columns
             if len(numeric_cols) >= 2:
-                viz_id = str(uuid.uuid4())
-                filename = f"data/visualizations/{viz_id}.html"
-                
-                fig = px.scatter(df, x=numeric_cols[0], y=numeric_cols[1], title=f"{numeric_cols[1]} vs {numeric_cols[0]}")
-                fig.write_html(filename)
+                fig = px.scatter(**column_arrays(df, x=numeric_cols[0], y=numeric_cols[1]), title=f"{numeric_cols[1]} vs {numeric_cols[0]}")
+                url = save_figure(fig)
                 
                 visualizations.append({
                     "title": f"{numeric_cols[1]} vs {numeric_cols[0]}",
                     "type": "scatter",
-                    "url": f"/visualizations/{viz_id}.html"
+                    "url": url
                 })
             
             return visualizations
@@ -349,106 +636,20 @@ class ReportGenerator:
             str: The URL of the generated report
         """
         try:
-            # Define the HTML template
-            template_str = """
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>{{ report_content.title }}</title>
-                <style>
-                    body {
-                        font-family: Arial, sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        padding: 20px;
-                    }
-                    h1 {
-                        color: #2c3e50;
-                        border-bottom: 2px solid #3498db;
-                        padding-bottom: 10px;
-                    }
-                    h2 {
-                        color: #2980b9;
-                        margin-top: 30px;
-                    }
-                    .visualization {
-                        margin: 30px 0;
-                        text-align: center;
-                    }
-                    .visualization iframe {
-                        width: 100%;
-                        height: 500px;
-                        border: none;
-                    }
-                    .metadata {
-                        background-color: #f8f9fa;
-                        padding: 15px;
-                        border-radius: 5px;
-                        margin-top: 40px;
-                        font-size: 0.9em;
-                    }
-                    .executive-summary {
-                        background-color: #e8f4f8;
-                        padding: 20px;
-                        border-radius: 5px;
-                        margin: 20px 0;
-                    }
-                </style>
-            </head>
-            <body>
-                <h1>{{ report_content.title }}</h1>
-                
-                <div class="metadata">
-                    <p><strong>Generated:</strong> {{ timestamp }}</p>
-                    <p><strong>Query:</strong> {{ query }}</p>
-                    <p><strong>Report ID:</strong> {{ report_id }}</p>
-                </div>
-                
-                {% for section in report_content.sections %}
-                    <h2>{{ section.title }}</h2>
-                    {% if section.title == "Executive Summary" %}
-                        <div class="executive-summary">
-                            {{ section.content | safe }}
-                        </div>
-                    {% else %}
-                        <div>
-                            {{ section.content | safe }}
-                        </div>
-                    {% endif %}
-                    
-                    {% if section.title == "Data Analysis" or section.title == "Key Findings" %}
-                        {% for viz in visualizations %}
-                            <div class="visualization">
-                                <h3>{{ viz.title }}</h3>
-                                <iframe src="{{ viz.url }}"></iframe>
-                            </div>
-                        {% endfor %}
-                    {% endif %}
-                {% endfor %}
-            </body>
-            </html>
-            """
-            
-            # Create a Jinja2 template
-            template = Template(template_str)
-            
-            # Render the template
-            html = template.render(
+            # Render the template straight into the report file, in buffered chunks
+            stream = HTML_REPORT_TEMPLATE.stream(
                 report_content=report_content,
                 visualizations=visualizations,
                 timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 query=query,
                 report_id=report_id
             )
+            stream.enable_buffering(size=64)
             
             # Save the HTML report
             filename = f"data/reports/{report_id}.html"
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(html)
+            with open(filename, "w", encoding="utf-8", buffering=1 << 16) as f:
+                stream.dump(f)
             
             return f"/reports/{report_id}.html"
         
@@ -505,11 +706,49 @@ class ReportGenerator:
             
             # Save the JSON report
             filename = f"data/reports/{report_id}.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(json_report, f, indent=2)
+            # Written as the encoder's bytes, with no str copy in between
+            with open(filename, "wb") as f:
+                f.write(_json_bytes(json_report))
             
             return f"/reports/{report_id}.json"
         
         except Exception as e:
             logging.error(f"Error generating JSON report: {str(e)}")
-            raise Exception(f"Failed to generate JSON report: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to generate JSON report: {str(e)}")
+
+# Shared process pool behind ReportGenerator.generate_report_batch, created
+# on first use
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+# The generator a batch worker process reuses for every job it serves
+_worker_generator = None
+
+def _init_batch_worker(generator_cls):
+    """Build the worker's generator once, paying the heavy imports up front"""
+    global _worker_generator
+    _worker_generator = generator_cls()
+
+def _run_batch_job(job):
+    """Generate one report in a batch worker process; None if it failed"""
+    data, query, format = job
+    try:
+        return _worker_generator.generate_report(data, query, format)
+    except Exception as e:
+        # One bad job shouldn't lose the rest of the batch's reports
+        logging.error(f"Error generating batch report: {str(e)}")
+        return None
+
+def _get_batch_pool(generator_cls):
+    """Return the shared batch process pool, starting it if needed"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            # Spawned rather than forked: the parent runs executor threads
+            # that a forked child would inherit mid-state
+            _batch_pool = ProcessPoolExecutor(
+                max_workers=REPORT_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_batch_worker,
+                initargs=(generator_cls,)
+            )
+        return _batch_pool